@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-import uuid
+from uuid import uuid4
 
 import httpx
 from fastapi import FastAPI, Request, Response, HTTPException
@@ -72,7 +72,7 @@ async def chat(req: ChatRequest, request: Request, response: Response) -> ChatRe
         - With status 502 if receiving an HTTP error response from the orchestrator.
         - With status 502 for unexpected errors during request processing.
     """
-    request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+    request_id = request.headers.get("X-Request-ID") or uuid4().hex
     response.headers["X-Request-ID"] = request_id
 
     # Store request_id in the request state so the Filter can read it
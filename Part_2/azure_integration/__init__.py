@@ -1,6 +1,6 @@
 from .interfaces import ILLMClient, IEmbeddingsClient
 from .config import AzureOpenAIConfig, load_config
-from .clients import AzureChatClient, AzureEmbeddingsClient
+from .clients import AzureChatClient, AzureEmbeddingsClient, EmbeddingDispatcher
 from dotenv import load_dotenv
 
 # Load .env once when the module is imported
@@ -13,4 +13,5 @@ __all__ = [
     "load_config",
     "AzureChatClient",
     "AzureEmbeddingsClient",
+    "EmbeddingDispatcher",
 ]
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import asyncio
+import os
 import time
-from typing import Iterable, List, Optional, Dict, Callable
+from typing import AsyncIterator, Iterable, List, Optional, Dict, Callable
 
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
 from openai._exceptions import APIError, RateLimitError, APITimeoutError
 
 from .config import AzureOpenAIConfig
@@ -11,6 +13,12 @@ from .interfaces import ILLMClient, IEmbeddingsClient
 
 TelemetryHook = Callable[[str, Dict], None]  # (event_name, payload)
 
+# Process-wide cap on in-flight async Azure requests. Unbounded fan-out
+# under load turns into 429s and retry storms; one shared semaphore keeps
+# concurrency at a level the deployment's rate limits can absorb. Sync
+# callers run in worker threads and are bounded by the thread pool.
+_AZURE_SEM = asyncio.Semaphore(int(os.getenv("AZURE_MAX_CONCURRENT", "10")))
+
 
 def _retry_loop(fn, *, retries: int, backoff_base: float, on_error: Optional[TelemetryHook] = None):
     attempt = 0
@@ -26,6 +34,20 @@ def _retry_loop(fn, *, retries: int, backoff_base: float, on_error: Optional[Tel
             time.sleep(backoff_base * (2 ** (attempt - 1)))
 
 
+async def _retry_loop_async(fn, *, retries: int, backoff_base: float, on_error: Optional[TelemetryHook] = None):
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except (RateLimitError, APITimeoutError, APIError) as e:
+            attempt += 1
+            if on_error:
+                on_error("azure.request.error", {"attempt": attempt, "type": type(e).__name__, "message": str(e)})
+            if attempt > retries:
+                raise
+            await asyncio.sleep(backoff_base * (2 ** (attempt - 1)))
+
+
 class AzureChatClient(ILLMClient):
     """Thin Azure Chat adapter with optional JSON mode and simple retries."""
 
@@ -43,6 +65,12 @@ class AzureChatClient(ILLMClient):
             azure_endpoint=cfg.endpoint,
             timeout=cfg.request_timeout_s,
         )
+        self.aclient = AsyncAzureOpenAI(
+            api_key=cfg.api_key,
+            api_version=cfg.api_version,
+            azure_endpoint=cfg.endpoint,
+            timeout=cfg.request_timeout_s,
+        )
         self.default_deployment = cfg.chat_deployment
         self.on_result = on_result
         self.on_error = on_error
@@ -83,6 +111,146 @@ class AzureChatClient(ILLMClient):
             )
         return out
 
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.2,
+        json_mode: bool = False,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Async variant of chat(); awaitable so the event loop stays free."""
+        deployment = model or self.default_deployment
+
+        async def _call():
+            resp = await self.aclient.chat.completions.create(
+                model=deployment,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"} if json_mode else None,
+                extra_headers=extra_headers,
+            )
+            return resp.choices[0].message.content or ""
+
+        async with _AZURE_SEM:
+            out = await _retry_loop_async(
+                _call,
+                retries=self.cfg.max_retries,
+                backoff_base=self.cfg.backoff_base_s,
+                on_error=self.on_error,
+            )
+        if self.on_result:
+            self.on_result(
+                "azure.chat.success",
+                {"deployment": deployment, "json_mode": json_mode, "len_messages": len(messages), "len_out": len(out)},
+            )
+        return out
+
+    async def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.2,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[str]:
+        """Yield assistant text deltas as they arrive.
+
+        Retries cover the initial connection only; once tokens are flowing,
+        errors propagate to the consumer, which already holds partial text.
+        """
+        deployment = model or self.default_deployment
+
+        async def _open():
+            return await self.aclient.chat.completions.create(
+                model=deployment,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                extra_headers=extra_headers,
+                stream=True,
+            )
+
+        # The slot is held for the whole stream: the request stays in
+        # flight on the Azure side until the last token arrives.
+        async with _AZURE_SEM:
+            stream = await _retry_loop_async(
+                _open,
+                retries=self.cfg.max_retries,
+                backoff_base=self.cfg.backoff_base_s,
+                on_error=self.on_error,
+            )
+            n_out = 0
+            async for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if delta:
+                    n_out += len(delta)
+                    yield delta
+        if self.on_result:
+            self.on_result(
+                "azure.chat.success",
+                {"deployment": deployment, "json_mode": False, "len_messages": len(messages), "len_out": n_out},
+            )
+
+
+class EmbeddingDispatcher:
+    """Coalesces concurrent single-text embedding requests into batches.
+
+    Callers await embed(text); everything queued within the batch window
+    (or until the batch cap is reached) is flushed as one embed_texts call
+    in a worker thread, so one network round-trip serves up to batch_max
+    callers instead of one each.
+    """
+
+    def __init__(
+        self,
+        embedder: IEmbeddingsClient,
+        *,
+        window_ms: float = 20.0,
+        batch_max: int = 16,
+    ):
+        self.embedder = embedder
+        self.window_s = window_ms / 1000.0
+        self.batch_max = batch_max
+        self._queue: "asyncio.Queue[tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str) -> List[float]:
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, fut))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+        return await fut
+
+    async def _drain(self) -> None:
+        while not self._queue.empty():
+            # Let concurrent callers pile up for one window before flushing.
+            await asyncio.sleep(self.window_s)
+            batch: List[tuple] = []
+            while len(batch) < self.batch_max and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if not batch:
+                return
+            try:
+                async with _AZURE_SEM:
+                    vectors = await asyncio.to_thread(
+                        self.embedder.embed_texts, [text for text, _ in batch]
+                    )
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, fut), vec in zip(batch, vectors):
+                if not fut.done():
+                    fut.set_result(vec)
+
 
 class AzureEmbeddingsClient(IEmbeddingsClient):
     """Azure Embeddings adapter with batching + retries."""
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -31,6 +32,9 @@ class AzureOpenAIConfig:
     :type max_retries: int
     :ivar backoff_base_s: The base backoff interval, in seconds, for handling retries.
     :type backoff_base_s: float
+    :ivar max_concurrent: The process-wide cap on concurrent async Azure
+        requests (enforced by the client module's shared semaphore).
+    :type max_concurrent: int
     """
     endpoint: str
     api_key: str
@@ -41,9 +45,13 @@ class AzureOpenAIConfig:
     request_timeout_s: float
     max_retries: int
     backoff_base_s: float
+    max_concurrent: int = int(os.getenv("AZURE_MAX_CONCURRENT", "10"))
 
 
+@lru_cache(maxsize=1)
 def load_config() -> AzureOpenAIConfig:
+    # The config is frozen and the environment does not change mid-run;
+    # every caller shares one instance instead of re-reading os.environ.
     return AzureOpenAIConfig(
         endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
         api_key=os.getenv("AZURE_OPENAI_API_KEY"),
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Iterable, List, Protocol, Optional, Dict
+from typing import AsyncIterator, Iterable, List, Protocol, Optional, Dict
 
 
 class ILLMClient(Protocol):
@@ -23,6 +23,31 @@ class ILLMClient(Protocol):
         """Return assistant text (JSON string if json_mode=True)."""
         ...
 
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.2,
+        json_mode: bool = False,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Async variant of chat(); same contract, awaitable."""
+        ...
+
+    def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.2,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream assistant text deltas; iterate with `async for`."""
+        ...
+
 
 class IEmbeddingsClient(Protocol):
     def embed_texts(
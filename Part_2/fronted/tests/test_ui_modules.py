@@ -0,0 +1,20 @@
+"""
+Smoke test guarding against a second ui_gradio module sneaking back in.
+A duplicate copy imported under another path would build a second Blocks
+instance and register duplicate event handlers during test collection.
+"""
+from __future__ import annotations
+import importlib
+import sys
+
+
+def test_no_duplicate_ui_gradio_module():
+    mod = importlib.import_module("Part_2.fronted.ui_gradio")
+    again = importlib.import_module("Part_2.fronted.ui_gradio")
+    assert mod is again
+
+    dupes = [
+        name for name in sys.modules
+        if name.endswith("ui_gradio") and name != "Part_2.fronted.ui_gradio"
+    ]
+    assert not dupes, f"Duplicate ui_gradio modules imported: {dupes}"
@@ -48,12 +48,13 @@ with gr.Blocks(css=css, title="MicroChat Medical") as demo:
     )
 
     # Chat + input
+    # Citations arrive pre-rendered as plain text from ui_logic, so we can
+    # skip the per-update Markdown parse entirely (cheaper for long RAG answers).
     chat = gr.Chatbot(
         height=500,
         elem_id="chatbot",
         show_label=False,
-        bubble_full_width=False,
-        render_markdown=True,
+        render_markdown=False,
     )
 
     msg = gr.Textbox(
@@ -1,10 +1,11 @@
 from __future__ import annotations
+import functools
 import logging
 import os
 import re
 import urllib.parse
-import uuid
 from typing import List, Tuple
+from uuid import uuid4
 
 import httpx
 
@@ -12,6 +13,7 @@ from ..core_models import (
     ChatResponse, ChatRequest, SessionBundle,
     UserProfile, ConversationHistory, Phase, Locale, Turn
 )
+from ..retriever.config import RetrieverConfig
 from ..logging_config import setup_logging
 setup_logging("frontend")
 log = logging.getLogger(__name__)
@@ -32,13 +34,13 @@ TRANSLATIONS = {
         "language": "שפה",
         "system_intro": """שלום! אני עוזר רפואי חכם שנועד לסייע לך בשאלות הנוגעות לשירותים רפואיים של קופות החולים הישראליות.
 
-**אני יכול לעזור לך עם:**
+אני יכול לעזור לך עם:
 • מידע על שירותים של מכבי, מאוחדת וכללית
 • מענה מותאם אישית בהתאם לקופת החולים שלך
 • הכוונה לשירותים רלוונטיים
 • מענה לשאלות כלליות על זכויות וטיפולים
 
-**כיצד אני עובד:**
+כיצד אני עובד:
 1. תחילה אאסוף ממך מידע בסיסי (קופת חולים, גיל וכו')
 2. לאחר מכן אוכל לענות על שאלות ספציפיות בצורה מדויקת
 
@@ -56,13 +58,13 @@ TRANSLATIONS = {
         "language": "Language",
         "system_intro": """Hello! I'm a smart medical assistant designed to help you with questions about Israeli health fund services.
 
-**I can help you with:**
+I can help you with:
 • Information about services from Maccabi, Meuhedet, and Clalit
 • Personalized answers based on your health fund
 • Guidance to relevant services
 • Answers to general questions about rights and treatments
 
-**How I work:**
+How I work:
 1. First, I'll collect basic information from you (health fund, age, etc.)
 2. Then I can answer specific questions accurately
 
@@ -100,14 +102,36 @@ async def post_chat(req: ChatRequest) -> ChatResponse:
         r = await client.post(
             f"{API_BASE}/chat",
             json=req.model_dump(),
-            headers={"X-Request-ID": str(uuid.uuid4())},
+            headers={"X-Request-ID": uuid4().hex},
         )
         r.raise_for_status()
         return ChatResponse.model_validate(r.json())
 
 
+@functools.cache
+def _kb_paths() -> frozenset[str]:
+    """
+    One-time recursive os.scandir of the KB directory.
+    The KB is static at runtime, so citation checks become an O(1) set
+    membership test instead of a stat() syscall per citation per turn.
+    """
+    paths: set[str] = set()
+    stack = [RetrieverConfig().kb_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        paths.add(os.path.abspath(entry.path))
+        except OSError:
+            continue
+    return frozenset(paths)
+
+
 def _citation_target_exists(uri: str) -> bool:
-    """Lightweight existence check: files via os.path, URLs assumed OK."""
+    """Lightweight existence check: files via the cached KB listing, URLs assumed OK."""
     try:
         parsed = urllib.parse.urlparse(uri)
     except Exception:
@@ -116,7 +140,7 @@ def _citation_target_exists(uri: str) -> bool:
     if parsed.scheme in ("http", "https"):
         return True
     if parsed.scheme == "file":
-        return os.path.exists(parsed.path)
+        return os.path.abspath(parsed.path) in _kb_paths()
     return False
 
 
@@ -125,10 +149,12 @@ def enrich_text_with_citation_links(
     citations: List[str],
 ) -> Tuple[str, List[str]]:
     """
-    Turns [d] into [d](uri) only when:
-    - d is within citations range
-    - target exists (for file://) or is http(s)
-    Returns (new_text, used_citation_links).
+    Resolves [d] references to their source URIs, keeping only the ones that:
+    - are within the citations range
+    - point at an existing target (for file://) or are http(s)
+    The references stay plain text in the answer (the Chatbot renders without
+    Markdown), and the valid sources come back as ready-to-display lines.
+    Returns (text, used_citation_lines).
     """
     if not citations:
         return text, []
@@ -155,20 +181,8 @@ def enrich_text_with_citation_links(
         else:
             log.info("Citation index [%d] out of range", idx)
 
-    idx_to_uri = {idx: uri for idx, uri in used}
-
-    def repl(match: re.Match) -> str:
-        idx = int(match.group(1))
-        uri = idx_to_uri.get(idx)
-        if not uri:
-            return match.group(0)
-        # Properly encode unsafe characters
-        safe_uri = urllib.parse.quote(uri, safe="/:#?&=")
-        return f"[{idx}]({safe_uri})"
-
-    new_text = re.sub(r"\[(\d+)\]", repl, text)
-    sources_lines = [f"[{idx}]({uri})" for idx, uri in used]
-    return new_text, sources_lines
+    sources_lines = [f"[{idx}] {uri}" for idx, uri in used]
+    return text, sources_lines
 
 
 def header_html(lang: str) -> str:
@@ -222,7 +236,7 @@ async def fetch_assistant_reply(
 
         if used_sources:
             citations_block = "\n".join(f"• {line}" for line in used_sources)
-            assistant_text += f"\n\n—\n**{t['sources']}:**\n{citations_block}"
+            assistant_text += f"\n\n—\n{t['sources']}:\n{citations_block}"
 
         history[-1][1] = assistant_text
 
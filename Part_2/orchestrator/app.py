@@ -1,7 +1,11 @@
 from __future__ import annotations
-import logging, uuid
+import asyncio
+import logging
+from uuid import uuid4
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from .config import OrchestratorConfig
 from .service import OrchestratorService
@@ -9,7 +13,7 @@ from ..azure_integration import load_config, AzureEmbeddingsClient, AzureChatCli
 from ..core_models import ChatResponse, ChatRequest
 from ..logging_config import setup_logging
 from ..retriever.config import RetrieverConfig
-from ..retriever.kb import HtmlKB
+from ..retriever.kb import HtmlKB, get_shared_kb
 
 setup_logging("orchestrator")
 log = logging.getLogger("orchestrator.app")
@@ -24,23 +28,35 @@ embedder = AzureEmbeddingsClient(
     on_error=lambda event_name, payload: log.info("telemetry %s: %s", event_name, payload)
 
 )
-kb = HtmlKB(
-    ret_cfg.kb_dir,
-    embedder,
-    cache_dir=ret_cfg.cache_dir,
-    embeddings_deployment=ret_cfg.embeddings_deployment,
-)
 chat_client = AzureChatClient(aoai_cfg)
 
+
+def _build_kb() -> HtmlKB:
+    return get_shared_kb(
+        ret_cfg.kb_dir,
+        embedder,
+        cache_dir=ret_cfg.cache_dir,
+        embeddings_deployment=ret_cfg.embeddings_deployment,
+        quantize=ret_cfg.quantize_vectors,
+    )
+
+
+# KB construction parses + embeds the corpus; defer it past process boot and
+# warm it in the background so INFO turns are served immediately.
 svc = OrchestratorService(
     orch_cfg=orch_cfg,
     embedder=embedder,
     chat_client=chat_client,
-    kb=kb,
+    kb_factory=_build_kb,
 )
 
 app = FastAPI(title="MicroChat Medical – Orchestrator", version="1.0.0")
 
+
+@app.on_event("startup")
+async def warm_kb() -> None:
+    asyncio.create_task(svc.warmup())
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], allow_methods=["*"], allow_headers=["*"], allow_credentials=True
@@ -52,7 +68,7 @@ async def health() -> dict:
 
 @app.post("/v1/chat", response_model=ChatResponse)
 async def chat(req: ChatRequest, request: Request) -> ChatResponse:
-    request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+    request_id = request.headers.get("X-Request-ID") or uuid4().hex
     log.info("Orchestrator /v1/chat start")
 
     try:
@@ -63,3 +79,16 @@ async def chat(req: ChatRequest, request: Request) -> ChatResponse:
         log.exception("orchestrator error")
         # Let gateway convert this into 502
         raise
+
+@app.post("/v1/chat/stream")
+async def chat_stream(req: ChatRequest, request: Request) -> StreamingResponse:
+    """NDJSON stream of ChatResponse snapshots; the last line is final."""
+    request_id = request.headers.get("X-Request-ID") or uuid4().hex
+    log.info("Orchestrator /v1/chat/stream start")
+
+    async def gen():
+        async for resp in svc.handle_chat_stream(req, request_id=request_id):
+            yield resp.model_dump_json() + "\n"
+        log.info("Orchestrator /v1/chat/stream success")
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
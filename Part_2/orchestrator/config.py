@@ -22,6 +22,19 @@ class OrchestratorConfig:
     # Retrieval knobs (consumed at query time)
     top_k: int = int(os.getenv("RETRIEVER_TOP_K", "6"))
     max_context_chars: int = int(os.getenv("MAX_CONTEXT_CHARS", "12000"))
+    # Token budget for retrieved snippets (used when tiktoken is installed;
+    # max_context_chars remains the fallback unit)
+    max_context_tokens: int = int(os.getenv("MAX_CONTEXT_TOKENS", "3000"))
     max_history_chars: int = int(os.getenv("MAX_HISTORY_CHARS", "42000"))
+    # Completion caps — output tokens dominate latency and billing, so these
+    # sit near observed p95 response lengths rather than at generous defaults.
+    # The INFO cap must still fit the worst-case READY_TO_CONFIRM turn: a
+    # Hebrew summary of all 8 fields plus a full 8-field patch in one JSON
+    # object — truncating that mid-object loses the entire patch.
+    info_max_tokens: int = int(os.getenv("INFO_MAX_TOKENS", "300"))
+    qna_max_tokens: int = int(os.getenv("QNA_MAX_TOKENS", "350"))
+    # Semantic answer cache for the QnA phase
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    semantic_cache_size: int = int(os.getenv("SEMANTIC_CACHE_SIZE", "256"))
     # Timeouts / tracing
     request_timeout_s: float = float(os.getenv("ORCH_TIMEOUT_S", "45"))
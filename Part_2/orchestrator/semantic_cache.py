@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# Cache entries are partitioned by everything the generation prompt
+# conditions on — (hmo, tier, locale, gender, birth_year) — so an answer is
+# only ever reused for a user the prompt would describe identically.
+PartitionKey = Tuple[Optional[str], Optional[str], str, Optional[str], Optional[int]]
+
+
+class SemanticCache:
+    """In-process answer cache for repeated or paraphrased QnA questions.
+
+    Two levels: an exact-match lookup on the raw retrieval query (free, no
+    embedding call) and a semantic lookup that compares query embeddings by
+    cosine similarity against stored entries in the same partition. A hit
+    short-circuits both KB retrieval and the LLM round-trip — the dominant
+    latency of a QnA turn. Entries are kept in a bounded LRU.
+    """
+
+    def __init__(self, *, threshold: float = 0.95, max_entries: int = 256):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # (partition, query) -> (embedding, answer, citations)
+        self._entries: "OrderedDict[Tuple[PartitionKey, str], Tuple[List[float], str, List[str]]]" = OrderedDict()
+
+    def lookup_exact(self, partition: PartitionKey, query: str) -> Optional[Tuple[str, List[str]]]:
+        """Sub-millisecond hit for a byte-identical repeated question."""
+        key = (partition, query)
+        hit = self._entries.get(key)
+        if hit is None:
+            return None
+        self._entries.move_to_end(key)
+        return hit[1], hit[2]
+
+    def lookup_semantic(self, partition: PartitionKey, query_vec: List[float]) -> Optional[Tuple[str, List[str]]]:
+        """Best cosine match within the partition, if above the threshold."""
+        best_key = None
+        best_score = 0.0
+        for key, (vec, _answer, _citations) in self._entries.items():
+            if key[0] != partition:
+                continue
+            score = _cos(query_vec, vec)
+            if score > best_score:
+                best_score = score
+                best_key = key
+        if best_key is None or best_score < self.threshold:
+            return None
+        self._entries.move_to_end(best_key)
+        hit = self._entries[best_key]
+        return hit[1], hit[2]
+
+    def store(
+        self,
+        partition: PartitionKey,
+        query: str,
+        query_vec: List[float],
+        answer: str,
+        citations: List[str],
+    ) -> None:
+        key = (partition, query)
+        self._entries[key] = (query_vec, answer, citations)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _cos(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a)) or 1.0
+    nb = math.sqrt(sum(y * y for y in b)) or 1.0
+    return dot / (na * nb)
@@ -1,14 +1,36 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import uuid
-from typing import Dict, List
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List
+from uuid import uuid4
+
+import orjson
+
+try:
+    import tiktoken
+
+    _ENCODER = tiktoken.get_encoding("cl100k_base")
+except Exception:  # pragma: no cover - optional; char budgeting still works
+    # Broad on purpose: get_encoding downloads the BPE file when it isn't
+    # cached, so on an offline host the failure is a connection error, not
+    # an ImportError — either way the char budget takes over.
+    _ENCODER = None
 
 from .config import OrchestratorConfig
 from .prompts import sys_prompt_info, sys_prompt_qna, user_instructions_qna
+from .semantic_cache import SemanticCache
 from .utils import _is_profile_complete_and_valid, _history_to_messages, _merge_patch, parse_llm_json
-from ..azure_integration import AzureOpenAIConfig, AzureEmbeddingsClient, AzureChatClient, IEmbeddingsClient, ILLMClient
+from ..azure_integration import (
+    AzureOpenAIConfig,
+    AzureEmbeddingsClient,
+    AzureChatClient,
+    EmbeddingDispatcher,
+    IEmbeddingsClient,
+    ILLMClient,
+)
 from ..core_models import ChatRequest, ChatResponse, Locale, Phase, SessionBundle, Turn
 from ..retriever.config import RetrieverConfig
 from ..retriever.kb import HtmlKB
@@ -16,6 +38,75 @@ from ..retriever.kb_interfaces import IKnowledgeBase
 
 log = logging.getLogger("orchestrator")
 
+# Explicit confirmations we can resolve without an LLM round-trip.
+# fullmatch (plus optional trailing punctuation) on purpose: a message
+# that merely *starts* with "yes"/"כן" may carry a correction after the
+# comma ("yes, but my ID is actually …") and must still reach the LLM.
+_CONFIRM_RE = re.compile(r"(?:yes|y|ok|okay|correct|confirmed?|כן|מאשר|מאשרת|אוקיי|נכון)[\s.!]*")
+
+# One snippet line in the QnA context block
+_SNIPPET_TMPL = "[{}] {} | {} | {} | {} | {} | {} | {}"
+
+_CANNED_CONFIRM = {
+    Locale.HE: "מעולה, כל הפרטים אושרו! נעבור לשלב השאלות והתשובות – במה אפשר לעזור?",
+    Locale.EN: "Great, your details are confirmed! Moving on to Q&A — how can I help?",
+}
+
+
+def _enum_val(v):
+    """Plain value of a possibly-enum field (None passes through)."""
+    return getattr(v, "value", v)
+
+
+def _trace_id(request_id: str | None) -> str:
+    """Caller-supplied request id, or a fresh hex uuid when absent."""
+    return request_id or uuid4().hex
+
+
+def _profile_snapshot_json(profile) -> str:
+    """Serialized short-key view of the profile for the INFO prompt.
+
+    Hand-built instead of model_dump(): skips the serializer machinery and
+    the short keys (documented in the prompt contract) cost fewer tokens
+    per turn than the full field names. UserProfile instances are not
+    hashable, so the JSON string is cached on the raw field tuple —
+    unchanged profiles across turns and retries reuse the same string.
+    """
+    return _snapshot_json(
+        profile.first_name,
+        profile.last_name,
+        profile.id_number,
+        _enum_val(profile.gender),
+        profile.birth_year,
+        _enum_val(profile.hmo_name),
+        profile.hmo_card_number,
+        _enum_val(profile.membership_tier),
+    )
+
+
+@lru_cache(maxsize=256)
+def _snapshot_json(fn, ln, id_num, g, by, hmo, card, tier) -> str:
+    # Unset fields are omitted rather than sent as null — the VALIDATION
+    # line already names what is missing, so nulls only cost prompt tokens.
+    # The gender default "unspecified" counts as unset for the same reason.
+    pairs = (
+        ("fn", fn), ("ln", ln), ("id", id_num), ("g", g),
+        ("by", by), ("hmo", hmo), ("card", card), ("tier", tier),
+    )
+    return orjson.dumps(
+        {k: v for k, v in pairs if v is not None and v != "unspecified"}
+    ).decode()
+
+
+def _profile_line(profile) -> str:
+    """One-line profile summary embedded in the QnA user message."""
+    return (
+        f"HMO={_enum_val(profile.hmo_name)} | "
+        f"Tier={_enum_val(profile.membership_tier)} | "
+        f"Gender={_enum_val(profile.gender)} | "
+        f"BirthYear={profile.birth_year}"
+    )
+
 # ---------------------------
 # Service
 # ---------------------------
@@ -38,22 +129,131 @@ class OrchestratorService:
     def __init__(self,
                  orch_cfg: OrchestratorConfig,
                  embedder: IEmbeddingsClient,
-                 kb: IKnowledgeBase,
-                 chat_client: ILLMClient,
+                 kb: IKnowledgeBase | None = None,
+                 chat_client: ILLMClient = None,
+                 semantic_cache: SemanticCache | None = None,
+                 kb_factory: Callable[[], IKnowledgeBase] | None = None,
                  ):
+        if kb is None and kb_factory is None:
+            raise ValueError("OrchestratorService needs either kb or kb_factory")
         self.cfg = orch_cfg
         self.embedder = embedder
+        # Either a ready KB (tests, eager callers) or a factory that builds
+        # it lazily off the event loop on first QnA use / warmup().
         self.kb = kb
+        self._kb_factory = kb_factory
+        self._kb_lock = asyncio.Lock()
         self.chat_client = chat_client
+        # Coalesces concurrent cache-lookup embeddings into batched calls
+        self._embed_dispatcher = EmbeddingDispatcher(embedder)
+        self.semantic_cache = semantic_cache or SemanticCache(
+            threshold=orch_cfg.semantic_cache_threshold,
+            max_entries=orch_cfg.semantic_cache_size,
+        )
+
+        # Phase routing as a table; unknown phases fall back to QnA.
+        self._phase_dispatch = {
+            Phase.INFO_COLLECTION: self._turn_info,
+            Phase.QNA: self._turn_qna,
+        }
+
+        # System prompts are pure functions of the 2-value Locale enum;
+        # build the full role/content message dicts once so each turn reuses
+        # the same objects instead of allocating them anew. Nothing mutates
+        # the message list entries downstream, so sharing is safe.
+        self._sys_info_msg = {loc: {"role": "system", "content": sys_prompt_info(loc)} for loc in Locale}
+        self._sys_qna_msg = {loc: {"role": "system", "content": sys_prompt_qna(loc)} for loc in Locale}
+        self._user_instr_qna = {loc: user_instructions_qna(loc) for loc in Locale}
+
+        # User-facing fallback strings, resolved per locale once instead of
+        # via inline conditionals on every error path.
+        self._fallback_llm_err = {
+            Locale.HE: (
+                "⚠️ הייתה בעיה טכנית בעיבוד הבקשה. "
+                "אנא נסה/י שוב בעוד מספר רגעים."
+            ),
+            Locale.EN: (
+                "⚠️ There was a technical problem handling your request. "
+                "Please try again in a moment."
+            ),
+        }
+        self._fallback_kb_err = {
+            Locale.HE: (
+                "⚠️ אני נתקל בבעיה בגישה למידע כרגע. "
+                "אפשר לנסות שוב מאוחר יותר, או לפנות ישירות לקופת החולים."
+            ),
+            Locale.EN: (
+                "⚠️ I'm having trouble accessing the knowledge base right now. "
+                "Please try again later or contact your HMO directly."
+            ),
+        }
+        self._fallback_no_match = {
+            Locale.HE: (
+                "לא מצאתי מידע רלוונטי לשאלה הזאת במסמכים שברשותי. "
+                "נסה/י לשאול אחרת או לפנות לקופת החולים לקבלת מידע מדויק."
+            ),
+            Locale.EN: (
+                "I couldn't find relevant information for this question "
+                "in the documents I have. Try rephrasing, or contact your HMO directly."
+            ),
+        }
 
     async def handle_chat(self, req: ChatRequest, *, request_id: str | None = None) -> ChatResponse:
         sb = req.session_bundle
         locale = sb.locale or sb.user_profile.locale or Locale.HE
 
         # Stay in INFO until explicitly confirmed and valid
+        turn = self._phase_dispatch.get(sb.phase, self._turn_qna)
+        return await turn(req, locale, request_id)
+
+    def _record_turn(self, sb: SessionBundle, user_text: str, assistant_text: str,
+                     citations: List[str] | None = None) -> None:
+        """Append a turn and bound the stored history in place.
+
+        The transcript is kept under twice the prompt history budget (the
+        prompt trim needs headroom to pick its window), so history walks
+        stay O(budget) instead of growing with session length.
+        """
+        turns = sb.history.turns
+        turns.append(Turn(user_text=user_text, assistant_text=assistant_text, citations=citations or []))
+        limit = self.cfg.max_history_chars * 2
+        total = sum(len(t.user_text or "") + len(t.assistant_text or "") for t in turns)
+        while len(turns) > 1 and total > limit:
+            dropped = turns.pop(0)
+            total -= len(dropped.user_text or "") + len(dropped.assistant_text or "")
+
+    async def _get_kb(self) -> IKnowledgeBase:
+        """KB instance, built on first use when constructed with a factory.
+
+        Construction parses and embeds the whole corpus, so it runs in a
+        worker thread behind a lock — concurrent first requests wait for one
+        build instead of racing several.
+        """
+        if self.kb is None:
+            async with self._kb_lock:
+                if self.kb is None:
+                    self.kb = await asyncio.to_thread(self._kb_factory)
+        return self.kb
+
+    async def warmup(self) -> None:
+        """Prebuild the KB in the background; INFO turns don't need it."""
+        await self._get_kb()
+
+    async def handle_chat_stream(self, req: ChatRequest, *, request_id: str | None = None):
+        """Streaming variant of handle_chat.
+
+        Async generator of ChatResponse snapshots; the last yielded response
+        is the final one. The INFO phase answers in a single JSON-contract
+        shot, so it yields exactly once; the QnA phase yields per delta.
+        """
+        sb = req.session_bundle
+        locale = sb.locale or sb.user_profile.locale or Locale.HE
+
         if sb.phase == Phase.INFO_COLLECTION:
-            return await self._turn_info(req, locale, request_id)
-        return await self._turn_qna(req, locale, request_id)
+            yield await self._turn_info(req, locale, request_id)
+            return
+        async for resp in self._turn_qna_stream(req, locale, request_id):
+            yield resp
 
     # ---------------------------
     # Info phase (LLM-driven JSON contract)
@@ -88,39 +288,55 @@ class OrchestratorService:
         user_text = req.user_input
 
         complete, problems = _is_profile_complete_and_valid(profile)
-        sys_msg = sys_prompt_info(locale)
-        profile_json = profile.model_dump()
+
+        # Fast path: profile already complete and the message is nothing but
+        # an explicit confirmation. A deterministic O(1) match replaces the
+        # whole LLM round-trip here.
+        if complete and _CONFIRM_RE.fullmatch(user_text.strip().lower()):
+            confirm_text = _CANNED_CONFIRM[locale]
+            self._record_turn(sb, user_text, confirm_text)
+            return ChatResponse(
+                assistant_text=confirm_text,
+                suggested_phase=Phase.QNA,
+                citations=[],
+                validation_flags=[],
+                user_profile=profile,
+                trace_id=_trace_id(request_id),
+            )
+
+        profile_json_str = _profile_snapshot_json(profile)
 
         # Convert past turns to messages
         history_msgs = _history_to_messages(sb.history, max_chars=self.cfg.max_history_chars)
 
-        messages: List[Dict[str, str]] = [
-            {"role": "system", "content": sys_msg},
-            {"role": "system", "content": f"PROFILE_SNAPSHOT_JSON: {json.dumps(profile_json, ensure_ascii=False)}"},
-            {"role": "system", "content": f"VALIDATION: {'OK' if complete else 'MISSING/INVALID -> ' + '; '.join(problems)}"},
-        ]
+        # Keep the long static system prompt as a byte-identical prefix across
+        # turns (provider-side prompt caching); volatile per-turn state goes
+        # into the final user message instead of extra system messages.
+        messages: List[Dict[str, str]] = [self._sys_info_msg[locale]]
 
         # Insert conversation history (if any), before the latest user input
         messages.extend(history_msgs)
 
-        # Latest user input as the last user message
-        messages.append({"role": "user", "content": user_text})
-
-        # Important: request structured JSON
+        # Latest user input, prefixed with the current profile state
+        messages.append({
+            "role": "user",
+            "content": (
+                f"PROFILE={profile_json_str}\n"
+                f"VALIDATION={'OK' if complete else 'MISSING/INVALID -> ' + '; '.join(problems)}\n"
+                f"USER: {user_text}"
+            ),
+        })
+
+        # Important: request structured JSON. Await the async client so the
+        # event loop keeps serving other requests during the round-trip.
         try:
-            raw = self.chat_client.chat(
-                messages, temperature=0.2, max_tokens=350, json_mode=True
+            raw = await self.chat_client.achat(
+                messages, temperature=0.2, max_tokens=self.cfg.info_max_tokens, json_mode=True
             )
         except Exception as e:
             log.exception("LLM error during info phase", extra={"request_id": request_id})
             # User-safe fallback
-            fallback_text = (
-                "⚠️ הייתה בעיה טכנית בעיבוד הבקשה. "
-                "אנא נסה/י שוב בעוד מספר רגעים."
-            ) if locale == Locale.HE else (
-                "⚠️ There was a technical problem handling your request. "
-                "Please try again in a moment."
-            )
+            fallback_text = self._fallback_llm_err[locale]
             # Keep phase as INFO_COLLECTION and don’t mutate profile
             return ChatResponse(
                 assistant_text=fallback_text,
@@ -128,28 +344,28 @@ class OrchestratorService:
                 citations=[],
                 validation_flags=["LLM_ERROR"],
                 user_profile=profile,
-                trace_id=request_id or str(uuid.uuid4()),
+                trace_id=_trace_id(request_id),
             )
 
         parsed = parse_llm_json(raw)
 
-        assistant_say = (parsed.get("assistant_say") or "").strip()
-        patch = parsed.get("profile_patch") or {}
-        status = (parsed.get("status") or "ASKING").upper()
-        sb.history.turns.append(
-            Turn(
-                user_text=user_text,
-                assistant_text=assistant_say
-            )
-        )
+        # The contract asks for short keys (s/p/st) to trim output tokens;
+        # the long names are still accepted so older transcripts and the
+        # fallback payload keep working.
+        assistant_say = (parsed.get("s") or parsed.get("assistant_say") or "").strip()
+        patch = parsed.get("p") or parsed.get("profile_patch") or {}
+        status = (parsed.get("st") or parsed.get("status") or "ASKING").upper()
+        self._record_turn(sb, user_text, assistant_say)
 
-        # Merge & revalidate after LLM patch
+        # Merge & revalidate after LLM patch. An empty patch returns the
+        # same object, so the pre-call validity verdict still holds.
         new_profile = _merge_patch(profile, patch, request_id)
-        now_complete, _ = _is_profile_complete_and_valid(new_profile)
+        if new_profile is profile:
+            now_complete = complete
+        else:
+            now_complete, _ = _is_profile_complete_and_valid(new_profile)
 
         suggested_phase = Phase.INFO_COLLECTION
-        getattr(sb, "info_confirmed", False)
-
         if status == "CONFIRMED" and now_complete:
             suggested_phase = Phase.QNA
 
@@ -159,7 +375,7 @@ class OrchestratorService:
             citations=[],
             validation_flags=[],
             user_profile=new_profile,
-            trace_id=request_id or str(uuid.uuid4()),
+            trace_id=_trace_id(request_id),
         )
 
 
@@ -167,10 +383,22 @@ class OrchestratorService:
     # Q&A phase (grounded with KB)
     # ---------------------------
     async def _turn_qna(self, req: ChatRequest, locale: Locale, request_id: str | None) -> ChatResponse:
+        """Non-streaming QnA turn: drain the stream and return the final response."""
+        resp: ChatResponse | None = None
+        async for resp in self._turn_qna_stream(req, locale, request_id):
+            pass
+        return resp
+
+    async def _turn_qna_stream(self, req: ChatRequest, locale: Locale, request_id: str | None):
         """
         Handles the Q&A process, including retrieval of knowledge base entries, assembling context,
         and generating a conversational response.
 
+        Implemented as an async generator: while the completion streams in, a
+        ChatResponse snapshot with the accumulated text is yielded per delta,
+        and the last yielded response is the final one (history and the
+        semantic cache are updated exactly once, at the end).
+
         This function is designed to facilitate a chatbot's ability to retrieve relevant information
         from a knowledge base (KB) and provide meaningful, contextual responses to user queries.
         It operates in multiple stages: retrieval of documents from the KB, construction of
@@ -181,9 +409,9 @@ class OrchestratorService:
             locale (Locale): The locale specifying the language/region for the response.
             request_id (str | None): An optional unique identifier for tracking the request.
 
-        Returns:
-            ChatResponse: The chatbot's response, including the generated text, any relevant metadata,
-            and a trace ID.
+        Yields:
+            ChatResponse: Accumulating snapshots of the chatbot's response; the final one
+            includes the full text, any relevant metadata, and a trace ID.
 
         Raises:
             Exception: If an error occurs during KB searches or other operations. This is only logged
@@ -193,103 +421,176 @@ class OrchestratorService:
         profile = sb.user_profile
         query = req.user_input
 
-        # 1) Retrieval
-        try:
-            hints: List[str] = []
-            if profile.hmo_name: hints.append(str(profile.hmo_name.value))
-            if profile.membership_tier: hints.append(str(profile.membership_tier.value))
-            retrieval_query = " | ".join([query] + hints) if hints else query
+        # Resolve the enum values once; they feed the retrieval query and the
+        # cache partition below.
+        hmo_val = _enum_val(profile.hmo_name)
+        tier_val = _enum_val(profile.membership_tier)
+        retrieval_query = (
+            query if not (hmo_val or tier_val)
+            else " | ".join(filter(None, (query, hmo_val, tier_val)))
+        )
 
-            found = self.kb.search(
-                retrieval_query, hmo=profile.hmo_name, tier=profile.membership_tier, top_k=self.cfg.top_k
+        # 0) Semantic cache: repeated or paraphrased questions from users the
+        # prompt would describe identically reuse the stored answer and skip
+        # both retrieval and the LLM round-trip. The partition carries the
+        # full conditioning context (the prompt's profile line includes
+        # gender and birth year), and turns with prior history are never
+        # cached or served from cache — a follow-up like "ומה לגבי ילדים?"
+        # only means something inside its own session. Lookup failures only
+        # mean a miss.
+        partition = (hmo_val, tier_val, str(locale),
+                     _enum_val(profile.gender), profile.birth_year)
+        cacheable = not sb.history.turns
+        cached = self.semantic_cache.lookup_exact(partition, retrieval_query) if cacheable else None
+        query_vec = None
+        if cacheable and cached is None:
+            try:
+                query_vec = await self._embed_dispatcher.embed(retrieval_query)
+                cached = self.semantic_cache.lookup_semantic(partition, query_vec)
+            except Exception:
+                log.warning("Semantic cache lookup failed", extra={"request_id": request_id})
+        if cached is not None:
+            answer, citations = cached
+            self._record_turn(sb, query, answer, citations=list(citations))
+            yield ChatResponse(
+                assistant_text=answer,
+                suggested_phase=Phase.QNA,
+                citations=list(citations),
+                user_profile=profile,
+                validation_flags=[],
+                trace_id=_trace_id(request_id),
+            )
+            return
+
+        # 1) Retrieval, overlapped with history formatting. KB search blocks
+        # on a network embedding call, so the history walk costs nothing
+        # extra — the critical path is max(search, prep) instead of the sum.
+        try:
+            kb = await self._get_kb()
+            found, history_msgs = await asyncio.gather(
+                asyncio.to_thread(
+                    kb.search,
+                    retrieval_query, hmo=profile.hmo_name, tier=profile.membership_tier,
+                    top_k=self.cfg.top_k, query_vec=query_vec,
+                ),
+                asyncio.to_thread(
+                    _history_to_messages, sb.history, max_chars=self.cfg.max_history_chars
+                ),
             )
         except Exception as e:
             log.exception("KB search error", extra={"request_id": request_id})
-            fallback = (
-                "⚠️ אני נתקל בבעיה בגישה למידע כרגע. "
-                "אפשר לנסות שוב מאוחר יותר, או לפנות ישירות לקופת החולים."
-            ) if locale == Locale.HE else (
-                "⚠️ I'm having trouble accessing the knowledge base right now. "
-                "Please try again later or contact your HMO directly."
-            )
-            return ChatResponse(
+            fallback = self._fallback_kb_err[locale]
+            yield ChatResponse(
                 assistant_text=fallback,
                 suggested_phase=Phase.QNA,
                 citations=[],
                 user_profile=profile,
                 validation_flags=["KB_ERROR"],
-                trace_id=request_id or str(uuid.uuid4()),
+                trace_id=_trace_id(request_id),
             )
+            return
 
         # 2) If retrieval returns nothing – handle gracefully
         if not found:
             log.info("No KB results for query", extra={"request_id": request_id})
-            msg = (
-                "לא מצאתי מידע רלוונטי לשאלה הזאת במסמכים שברשותי. "
-                "נסה/י לשאול אחרת או לפנות לקופת החולים לקבלת מידע מדויק."
-            ) if locale == Locale.HE else (
-                "I couldn't find relevant information for this question "
-                "in the documents I have. Try rephrasing, or contact your HMO directly."
-            )
-            return ChatResponse(
+            msg = self._fallback_no_match[locale]
+            yield ChatResponse(
                 assistant_text=msg,
                 suggested_phase=Phase.QNA,
                 citations=[],
                 user_profile=profile,
                 validation_flags=["NO_KB_MATCH"],
-                trace_id=request_id or str(uuid.uuid4()),
+                trace_id=_trace_id(request_id),
             )
+            return
 
-        parts: List[str] = []
-        citations: List[str] = []
-        for i, ch in enumerate(found, start=1):
-            parts.append(f"[{i}] {ch.section} | {ch.service} | {ch.hmo} | {ch.tier_tags} | {ch.text} | {ch.source_uri} | {ch.kind}")
-            citations.append(ch.source_uri)
-        context_blob = "\n\n".join(parts)
-        if len(context_blob) > self.cfg.max_context_chars:
-            context_blob = context_blob[: self.cfg.max_context_chars] + "\n…"
-
-        sys_msg = sys_prompt_qna(locale)
-        user_instr = user_instructions_qna(locale)
-        profile_line = (
-            f"HMO={getattr(profile.hmo_name, 'value', profile.hmo_name)} | "
-            f"Tier={getattr(profile.membership_tier, 'value', profile.membership_tier)} | "
-            f"Gender={getattr(profile.gender, 'value', profile.gender)} | "
-            f"BirthYear={profile.birth_year}"
-        )
-
-        # History messages
-        history_msgs = _history_to_messages(sb.history, max_chars=self.cfg.max_history_chars)
-
-        messages: List[Dict[str, str]] = [
-            {"role": "system", "content": sys_msg},
-            {"role": "system", "content": f"Knowledge snippets:\n{context_blob}"},
-            {"role": "system", "content": f"User {profile_line}"},
+        parts: List[str] = [
+            _SNIPPET_TMPL.format(i, ch.section, ch.service, ch.hmo, ch.tier_tags, ch.text, ch.source_uri, ch.kind)
+            for i, ch in enumerate(found, 1)
         ]
+        citations: List[str] = [ch.source_uri for ch in found]
+
+        # Budget context in model tokens rather than characters: whole
+        # snippets are dropped from the tail instead of slicing mid-snippet,
+        # and citations stay aligned with what the model actually saw.
+        if _ENCODER is not None:
+            used = 0
+            kept = 0
+            for part in parts:
+                n = len(_ENCODER.encode(part))
+                if kept and used + n > self.cfg.max_context_tokens:
+                    break
+                used += n
+                kept += 1
+            parts = parts[:kept]
+            citations = citations[:kept]
+            context_blob = "\n\n".join(parts)
+        else:
+            # Char fallback mirrors the token path: keep whole snippets with
+            # a running total instead of building the oversized string first
+            # and slicing it, so overflow never materializes in memory.
+            used = 0
+            kept = 0
+            for part in parts:
+                if kept and used + len(part) + 2 > self.cfg.max_context_chars:
+                    break
+                used += len(part) + 2
+                kept += 1
+            truncated = kept < len(parts)
+            parts = parts[:kept]
+            citations = citations[:kept]
+            context_blob = "\n\n".join(parts) + ("\n…" if truncated else "")
+
+        user_instr = self._user_instr_qna[locale]
+        profile_line = _profile_line(profile)
+
+        # Static system prompt first and alone, so the cached prefix matches
+        # across turns; snippets and profile are per-turn and ride in the
+        # final user message.
+        messages: List[Dict[str, str]] = [self._sys_qna_msg[locale]]
 
         # Insert the past conversation before the current question
         messages.extend(history_msgs)
 
-        # Finally, the new question with instructions
-        messages.append(
-            {"role": "user", "content": f"{user_instr}\n\n{query}"}
-        )
-
-        answer = self.chat_client.chat(messages, temperature=0.2, max_tokens=600)
-        sb.history.turns.append(
-            Turn(
-                user_text=query,
-                assistant_text=answer,
-                citations=citations
+        # Finally, the new question with snippets, profile and instructions
+        messages.append({
+            "role": "user",
+            "content": (
+                f"Knowledge snippets:\n{context_blob}\n\n"
+                f"User {profile_line}\n\n"
+                f"{user_instr}\n\n{query}"
+            ),
+        })
+
+        # Stream the completion: each delta is surfaced immediately as a
+        # snapshot with the text accumulated so far, so callers can show
+        # partial answers while the model is still generating.
+        trace_id = _trace_id(request_id)
+        chunks: List[str] = []
+        async for delta in self.chat_client.achat_stream(
+            messages, temperature=0.2, max_tokens=self.cfg.qna_max_tokens
+        ):
+            chunks.append(delta)
+            yield ChatResponse(
+                assistant_text="".join(chunks),
+                suggested_phase=Phase.QNA,
+                citations=citations,
+                user_profile=profile,
+                validation_flags=[],
+                trace_id=trace_id,
             )
-        )
+        answer = "".join(chunks)
+        self._record_turn(sb, query, answer, citations=citations)
 
-        return ChatResponse(
+        if query_vec is not None:
+            self.semantic_cache.store(partition, retrieval_query, query_vec, answer, citations)
+
+        yield ChatResponse(
             assistant_text=answer,
             suggested_phase=Phase.QNA,
             citations=citations,
             user_profile=profile,
             validation_flags=[],
-            trace_id=request_id or str(uuid.uuid4()),
+            trace_id=trace_id,
         )
 
@@ -1,35 +1,65 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
+import pytest_asyncio
 
 from ...azure_integration import load_config, AzureEmbeddingsClient, AzureChatClient
-from ...core_models import SessionBundle, Locale, Phase, UserProfile, ChatRequest, ChatResponse, Gender
+from ...core_models import SessionBundle, Locale, Phase, UserProfile, ChatRequest, ChatResponse, Gender, HMO
 from ...orchestrator.config import OrchestratorConfig
 from ...orchestrator.service import OrchestratorService
 from ...retriever.config import RetrieverConfig
 from ...retriever.kb import HtmlKB
 
 
-@pytest.mark.asyncio
-async def test_orchestrator_service_handle_chat_real_request(cfgs):
-    orch_cfg, aoai_cfg, ret_cfg = cfgs
-    embedder = AzureEmbeddingsClient(aoai_cfg, default_deployment=ret_cfg.embeddings_deployment,
-                                     on_error=lambda event_name, payload: print("telemetry %s: %s", event_name,
-                                                                                   payload))
-    kb = HtmlKB(
+# Expensive collaborators are built once per session: client construction is
+# cheap but HtmlKB loads and embeds the whole corpus, which used to be paid
+# per test.
+@pytest.fixture(scope="session")
+def embedder():
+    ret_cfg = RetrieverConfig()
+    return AzureEmbeddingsClient(load_config(), default_deployment=ret_cfg.embeddings_deployment,
+                                 on_error=lambda event_name, payload: print("telemetry %s: %s", event_name,
+                                                                            payload))
+
+
+@pytest.fixture(scope="session")
+def kb(embedder):
+    ret_cfg = RetrieverConfig()
+    return HtmlKB(
         ret_cfg.kb_dir,
         embedder,
         cache_dir=ret_cfg.cache_dir,
         embeddings_deployment=ret_cfg.embeddings_deployment,
     )
-    chat_client = AzureChatClient(aoai_cfg)
 
+
+@pytest.fixture(scope="session")
+def chat_client():
+    return AzureChatClient(load_config())
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def warm_svc(embedder, kb, chat_client):
+    """Session-wide service with the retriever warmed for every HMO up front."""
     svc = OrchestratorService(
-        orch_cfg=orch_cfg,
+        orch_cfg=OrchestratorConfig(),
         embedder=embedder,
         chat_client=chat_client,
         kb=kb,
     )
+    # One dummy retrieval per HMO, in parallel, so even the first real case
+    # runs against a warm KB + embeddings cache.
+    await asyncio.gather(
+        *(asyncio.to_thread(kb.search, "שירותים רפואיים", hmo=h, tier=None, top_k=1) for h in HMO)
+    )
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_service_handle_chat_real_request(warm_svc):
+    svc = warm_svc
     # Minimal starting session (incomplete profile → INFO phase)
     sb = SessionBundle(
         locale=Locale.HE,
@@ -86,10 +116,21 @@ class FakeChatClient:
         self.calls.append({"messages": messages, "temperature": temperature, "max_tokens": max_tokens})
         return self.response
 
+    async def achat(self, messages, temperature: float, max_tokens: int, *args, **kwargs) -> str:
+        return self.chat(messages, temperature, max_tokens, *args, **kwargs)
+
+
+class FakeKB:
+    """No-op KB for INFO-phase tests, which never exercise retrieval."""
+    def search(self, query, *, hmo=None, tier=None, top_k=6, query_vec=None):
+        return []
+
 # ----------
 # Fixtures
 # ----------
-@pytest.fixture
+# Frozen dataclasses read from the environment once; nothing mutates them,
+# so one instance per session is enough.
+@pytest.fixture(scope="session")
 def cfgs():
     orch_cfg = OrchestratorConfig()
     aoai_cfg = load_config()
@@ -100,24 +141,15 @@ def cfgs():
 # Tests: INFO phase
 # ---------------
 @pytest.mark.asyncio
-async def test_orchestrator_service_handle_chat_fake_request(cfgs):
+async def test_orchestrator_service_handle_chat_fake_request(cfgs, embedder):
     orch_cfg, aoai_cfg, ret_cfg = cfgs
-    embedder = AzureEmbeddingsClient(aoai_cfg, default_deployment=ret_cfg.embeddings_deployment,
-                                     on_error=lambda event_name, payload: print("telemetry %s: %s", event_name,
-                                                                                payload))
-    kb = HtmlKB(
-        ret_cfg.kb_dir,
-        embedder,
-        cache_dir=ret_cfg.cache_dir,
-        embeddings_deployment=ret_cfg.embeddings_deployment,
-    )
-    chat_client = AzureChatClient(aoai_cfg)
 
+    # INFO phase never touches retrieval, so a FakeKB avoids the corpus load
     svc = OrchestratorService(
         orch_cfg=orch_cfg,
         embedder=embedder,
-        chat_client=chat_client,
-        kb=kb,
+        chat_client=None,
+        kb=FakeKB(),
     )
 
     # LLM returns well-formed JSON with a profile patch + CONFIRMED
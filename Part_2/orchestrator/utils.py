@@ -2,8 +2,22 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Any
 
+# orjson is pinned in requirements, but degrade to the stdlib parser when
+# the wheel is unavailable (same pattern as the optional tiktoken import).
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+    _loads = json.loads
+
+from pydantic import ValidationError
+
 from ..core_models import UserProfile, ConversationHistory
 
 log = logging.getLogger("orchestrator")
@@ -12,52 +26,93 @@ log = logging.getLogger("orchestrator")
 # ---------------------------
 # Helpers
 # ---------------------------
+# Specialized from the UserProfile schema at import time: field order and
+# problem strings come straight from model_fields, so the check cannot
+# drift when the model changes and the per-call work is a flat zip over
+# precomputed strings.
+_PROBLEM_NOTES = {"id_number": " (9 digits)", "hmo_card_number": " (9 digits)"}
+_PROFILE_FIELDS: Tuple[str, ...] = tuple(UserProfile.model_fields)
+_PROFILE_PROBLEMS: Tuple[str, ...] = tuple(
+    f"{name} missing{_PROBLEM_NOTES.get(name, '')}" for name in _PROFILE_FIELDS
+)
+
+
 def _is_profile_complete_and_valid(p: UserProfile) -> Tuple[bool, List[str]]:
-    problems: List[str] = []
-    if not p.first_name: problems.append("first_name missing")
-    if not p.last_name: problems.append("last_name missing")
-    if not p.id_number: problems.append("id_number missing (9 digits)")
-    if not p.gender or str(getattr(p.gender, "value", p.gender)).lower() == "unspecified":
-        problems.append("gender missing")
-    if not p.birth_year:
-        problems.append("birth_year missing")
-    if not p.hmo_name: problems.append("hmo_name missing")
-    if not p.hmo_card_number: problems.append("hmo_card_number missing (9 digits)")
-    if not p.membership_tier: problems.append("membership_tier missing")
-    return len(problems) == 0, problems
+    values = []
+    for name in _PROFILE_FIELDS:
+        v = getattr(p, name)
+        # The gender default is a sentinel, not a real answer
+        if name == "gender" and v is not None and str(getattr(v, "value", v)).lower() == "unspecified":
+            v = None
+        values.append(v)
+    ok, problems = _validity_for_fields(*values)
+    return ok, list(problems)
+
+
+@lru_cache(maxsize=256)
+def _validity_for_fields(*values) -> Tuple[bool, Tuple[str, ...]]:
+    # The check runs twice per INFO turn (before and after the patch) on the
+    # same field values most of the time; caching on the plain field tuple
+    # makes the repeat lookups free. Returns a tuple so cached entries stay
+    # immutable — the public wrapper hands callers a fresh list.
+    problems = tuple(msg for v, msg in zip(values, _PROFILE_PROBLEMS) if not v)
+    return not problems, problems
+
+# Normalization tables for LLM-supplied profile patches; read-only views
+# so no caller can mutate the shared tables.
+_HMO_MAP = MappingProxyType({"maccabi": "מכבי", "meuhedet": "מאוחדת", "clalit": "כללית"})
+_TIER_MAP = MappingProxyType({"gold": "זהב", "silver": "כסף", "bronze": "ארד"})
+_GENDER_MAP = MappingProxyType({"male": "male", "female": "female", "זכר": "male", "נקבה": "female"})
+
+# Only enum-backed fields need case folding; names keep the user's casing
+_CASEFOLDED_FIELDS = {"hmo_name", "membership_tier", "gender"}
+
 
 def _merge_patch(profile: UserProfile, patch: Dict[str, Any], request_id) -> UserProfile:
     """Safely merge partial user data without breaking validation."""
-    HMO = {"maccabi": "מכבי", "meuhedet": "מאוחדת", "clalit": "כללית"}
-    TIER = {"gold": "זהב", "silver": "כסף", "bronze": "ארד"}
-    GENDER = {"male": "male", "female": "female", "זכר": "male", "נקבה": "female"}
+    # The common "profile_patch: {}" case pays nothing and keeps identity,
+    # so callers can skip re-validation when the object is unchanged.
+    if not patch:
+        return profile
 
-    data = profile.model_dump()
+    update: Dict[str, Any] = {}
 
-    for k, v in (patch or {}).items():
+    for k, v in patch.items():
         if v is None:
             continue
-        if isinstance(v, str):
-            v = v.strip().lower()
-
+        # Per-field isolation: the LLM occasionally emits a wrong-typed
+        # value (e.g. a list where a string belongs), which would make the
+        # map lookups below raise. One bad field is logged and skipped, the
+        # rest of the patch still applies.
         try:
-            if k == "hmo_name":
-                v = HMO.get(v, v)
-            elif k == "membership_tier":
-                v = TIER.get(v, v)
-            elif k == "gender":
-                v = GENDER.get(v, v)
+            if isinstance(v, str):
+                v = v.strip()
+                if k in _CASEFOLDED_FIELDS:
+                    v = v.lower()
+
+            if k == "hmo_name" and isinstance(v, str):
+                v = _HMO_MAP.get(v, v)
+            elif k == "membership_tier" and isinstance(v, str):
+                v = _TIER_MAP.get(v, v)
+            elif k == "gender" and isinstance(v, str):
+                v = _GENDER_MAP.get(v, v)
             elif k == "birth_year" and isinstance(v, str) and v.isdigit():
                 v = int(v)
             elif k in {"id_number", "hmo_card_number"}:
                 v = str(v).strip()
-            data[k] = v
-        except Exception as e:
-            log.warning(f"Ignoring bad field {k}: {v!r} ({e})", extra={"request_id": request_id})
+        except Exception:
+            log.warning(f"Ignoring bad field {k}: {v!r}", extra={"request_id": request_id})
+            continue
+        update[k] = v
+
+    if not update:
+        return profile
 
     try:
-        return UserProfile(**data)
-    except Exception as e:
+        # Validate current values + patch directly; skips the model_dump
+        # serialization pass the old dump-mutate-reconstruct round trip paid.
+        return UserProfile.model_validate({**profile.__dict__, **update})
+    except ValidationError as e:
         log.warning(f"Profile validation failed: {e}", extra={"request_id": request_id})
         # Fallback to original profile if something still invalid
         return profile
@@ -79,22 +134,50 @@ def _history_to_messages(
         if t.assistant_text:
             msgs.append({"role": "assistant", "content": t.assistant_text})
 
-    # Trim from the *left* if too long
-    def total_chars(ms: List[Dict[str, str]]) -> int:
-        return sum(len(m["content"]) for m in ms)
+    # Trim from the *left* if too long: one running total and a slice,
+    # instead of re-summing the whole list per pop(0).
+    total = sum(len(m["content"]) for m in msgs)
+    i = 0
+    while i < len(msgs) and total > max_chars:
+        total -= len(msgs[i]["content"])
+        i += 1
+    return msgs[i:] if i else msgs
+
 
-    while msgs and total_chars(msgs) > max_chars:
-        msgs.pop(0)
+# Widest {...} span in a reply that wrapped its JSON in prose/code fences
+_JSON_BLOCK_RE = re.compile(r"\{.*\}", re.DOTALL)
 
-    return msgs
+_JSON_DECODER = json.JSONDecoder()
 
 
 def parse_llm_json(text: str) -> Dict[str, Any]:
     if not text or not isinstance(text, str):
         return _fallback_json()
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return _loads(text)
+    except ValueError:  # covers orjson.JSONDecodeError and the stdlib's
+        # json_mode usually guarantees bare JSON; when a reply still arrives
+        # wrapped (markdown fences, leading prose), salvage the object
+        # instead of discarding the whole turn. The stdlib parser handles
+        # the salvage path — it is more lenient than orjson and this branch
+        # is cold anyway.
+        start = text.find("{")
+        if start != -1:
+            # Optimistic pass: decode the first object and ignore whatever
+            # trails it (prose, a second fence) — cases the widest-span
+            # regex below would fold into one invalid blob.
+            try:
+                obj, _ = _JSON_DECODER.raw_decode(text[start:])
+                if isinstance(obj, dict):
+                    return obj
+            except ValueError:
+                pass
+        m = _JSON_BLOCK_RE.search(text)
+        if m:
+            try:
+                return json.loads(m.group(0))
+            except json.JSONDecodeError:
+                pass
         return _fallback_json()
 
 
@@ -23,7 +23,12 @@ class RetrieverConfig:
         cache_dir: A directory path for storing retriever cache data.
             Derived from the environment variable 'RETRIEVER_CACHE_DIR'
             or defaults to 'Part_2/.kb_cache' if not set.
+        quantize_vectors: Whether to keep KB vectors quantized to int8 in
+            memory (trades a little scoring precision for ~4x less RAM).
+            Derived from the environment variable 'RETRIEVER_QUANTIZE';
+            off by default.
     """
     kb_dir: str = os.getenv("PHASE2_DATA_DIR", "Part_2/phase2_data")
     embeddings_deployment: str = os.getenv("AZURE_OPENAI_EMBED_DEPLOYMENT", "text-embedding-ada-002")
     cache_dir: str = os.getenv("RETRIEVER_CACHE_DIR", "Part_2/.kb_cache")
+    quantize_vectors: bool = os.getenv("RETRIEVER_QUANTIZE", "0") == "1"
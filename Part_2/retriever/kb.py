@@ -4,12 +4,18 @@ import glob
 import hashlib
 import html
 import os
-import pickle
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Tuple, Optional, Iterable, Dict
 
-from bs4 import BeautifulSoup
+import lxml.html
+import numpy as np
+import orjson
+from lxml import etree
 
 from Part_2.azure_integration import IEmbeddingsClient
 from Part_2.core_models import HMO, Tier
@@ -62,6 +68,227 @@ class KBChunk:
             kind=d.get("kind", "benefit"),
         )
 
+# Stable enum orderings for the vectorized score-bias arrays
+_HMO2I = {h: i for i, h in enumerate(HMO)}
+_TIERS = tuple(Tier)
+_TIER2I = {t: i for i, t in enumerate(_TIERS)}
+
+
+def _normalized_matrix(vectors) -> np.ndarray:
+    """Float32 (N, D) matrix with unit-norm rows; cosine becomes a matmul."""
+    V = np.asarray(vectors, dtype=np.float32)
+    if V.size:
+        V /= np.linalg.norm(V, axis=1, keepdims=True).clip(min=1e-12)
+    return V
+
+
+# ----------------------------- Extractors -----------------------------
+# Module-level rather than methods so a cold build can farm files out to a
+# ProcessPoolExecutor: workers get plain paths and return plain dicts.
+
+# XPath compiled once at import; evaluation runs inside libxml2 instead of
+# walking a Python-level tree per node. Union results come back in
+# document order, which the section tracking below relies on.
+_XP_NODES = etree.XPath(".//h1|.//h2|.//h3|.//table|.//ul|.//p")
+_XP_ROWS = etree.XPath(".//tr")
+_XP_CELLS = etree.XPath("./td|./th")
+_XP_DIRECT_LIS = etree.XPath("./li")
+_XP_HREFS = etree.XPath(".//a/@href")
+
+# Compiled once; re.compile inside the extractors re-paid the pattern
+# cache lookup on every list/cell.
+_PHONE_RE = re.compile(
+    r"(?:\d{2,3}-\d{6,7}|"
+    r"\d{1}-\d{3}-\d{2}-\d{2}-\d{2}|"  # 1-700-50-53-53 style
+    r"\*?\d{3,4})"
+)
+_EXT_RE = re.compile(r"שלוחה\s*(\d+)")
+_TIER_SPLIT_RE = re.compile(r"(?=(?:זהב|כסף|ארד)\s*[:：])")
+_TIER_MATCH_RE = re.compile(r"(זהב|כסף|ארד)\s*[:：]\s*(.+)", re.S)
+_CLEAN_RE = re.compile(r"[ \t\n]+")
+
+
+def _text(node) -> str:
+    """All text under a node, whitespace-joined (lxml's get_text)."""
+    return " ".join(node.itertext())
+
+
+def _anchor(s: str) -> str:
+    """Deterministic 8-hex content anchor for source URIs. Built-in hash()
+    is randomized per process (PYTHONHASHSEED), which made anchors — and
+    anything cached against them — differ across runs and workers."""
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=4).hexdigest()
+
+
+def _parse_file(path: str) -> List[dict]:
+    """Parse one HTML file into chunk dicts (the picklable pool unit)."""
+    # Raw bytes go straight to libxml2, which honors <meta charset> itself;
+    # skipping the Python-side decode saves a full pass per file.
+    raw = Path(path).read_bytes()
+    return [c.to_dict() for c in _extract_chunks_from_html(path, raw)]
+
+
+def _extract_chunks_from_html(path: str, html_src: bytes | str) -> List[KBChunk]:
+    try:
+        doc = lxml.html.fromstring(html_src)
+    except ValueError:
+        # Rare mismatch between the document's encoding declaration and the
+        # input form; fall back to the decoded-string path.
+        if not isinstance(html_src, bytes):
+            raise
+        doc = lxml.html.fromstring(html_src.decode("utf-8", errors="ignore"))
+    chunks: List[KBChunk] = []
+    section = None
+
+    # Track the current section by nearest preceding h1/h2/h3
+    for node in _XP_NODES(doc):
+        if node.tag in ("h1","h2","h3"):
+            section = _clean(_text(node))
+            continue
+
+        if node.tag == "table":
+            chunks.extend(_extract_table_records(path, node, section))
+        elif node.tag == "ul":
+            chunks.extend(_extract_list_contacts(path, node, section))
+        elif node.tag == "p":
+            txt = _clean(_text(node))
+            if txt:
+                chunks.append(KBChunk(
+                    text=txt, source_uri=f"file://{path}#p{_anchor(txt)}",
+                    hmo=None, tier_tags=(), section=section, service=None, kind="blurb"
+                ))
+    return chunks
+
+
+def _extract_table_records(path: str, table, section: Optional[str]) -> List[KBChunk]:
+    """Build atomic records: (service × hmo × tier) with benefit text."""
+    rows = _XP_ROWS(table)
+    if not rows: return []
+    headers = [_clean(_text(th)) for th in _XP_CELLS(rows[0])]
+    # Try to identify HMO columns
+    hmo_cols: Dict[int, HMO] = {}
+    for idx, h in enumerate(headers):
+        low = (h or "").lower()
+        if "מכבי" in low or "maccabi" in low:   hmo_cols[idx] = HMO.MACCABI
+        if "מאוחדת" in low or "meuhedet" in low:hmo_cols[idx] = HMO.MEUHEDET
+        if "כללית" in low or "clalit" in low:   hmo_cols[idx] = HMO.CLALIT
+
+    out: List[KBChunk] = []
+    for r_i, tr in enumerate(rows[1:], start=1):
+        cells = _XP_CELLS(tr)
+        if not cells: continue
+        service = _clean(_text(cells[0])) if cells else None
+
+        for c_i, td in enumerate(cells[1:], start=1):
+            hmo = hmo_cols.get(c_i)
+            if not hmo: continue
+            cell_text = _clean(_text(td))
+            # Split tiers inside cell (bold labels or keywords)
+            for tier_label, benefit in _split_tiers(cell_text):
+                out.append(KBChunk(
+                    text=f"{benefit}",
+                    source_uri=f"file://{path}#t{r_i}_{c_i}",
+                    hmo=hmo,
+                    tier_tags=(tier_label,) if tier_label else (),
+                    section=section,
+                    service=service,
+                    kind="benefit",
+                ))
+    return out
+
+
+def _extract_list_contacts(path: str, ul, section: Optional[str]) -> List[KBChunk]:
+    """
+    Handles three common <ul> patterns:
+      1) Services bullets (no phones/urls)           -> kind="service",   hmo=None
+      2) HMO contact bullets with phones (and ext)   -> kind="contact",   hmo=parsed
+      3) 'More info' bullets with phone + URL        -> kind="contact",   hmo=parsed, text includes url
+    """
+    out: List[KBChunk] = []
+
+    def li_urls(li) -> List[str]:
+        return [href for href in _XP_HREFS(li) if href]
+
+    for li in _XP_DIRECT_LIS(ul):
+        raw_txt = _text(li)
+        txt = _clean(raw_txt)
+        if not txt:
+            continue
+
+        urls = li_urls(li)
+        phones = _PHONE_RE.findall(txt)
+        hmo = _guess_hmo_from_text(txt)
+        ext = _EXT_RE.search(txt)
+        has_phone = bool(phones)
+        has_url = bool(urls)
+
+        # Case 2/3: contacts (with optional URL)
+        if has_phone or ("טלפון" in txt) or has_url:
+            bits = []
+            if phones: bits.append("; ".join(phones))
+            if ext:    bits.append(f"שלוחה {ext.group(1)}")
+            if urls:   bits.append("; ".join(urls))
+            payload = " | ".join(bits) if bits else txt
+            out.append(KBChunk(
+                text=payload,
+                source_uri=f"file://{path}#c{_anchor(txt)}",
+                hmo=hmo,
+                tier_tags=(),
+                section=section,
+                service=None,
+                kind="contact",
+            ))
+            continue
+
+        # Case 1: plain services bullet (no phones/urls)
+        out.append(KBChunk(
+            text=txt,
+            source_uri=f"file://{path}#s{_anchor(txt)}",
+            hmo=None,
+            tier_tags=(),
+            section=section,
+            service=txt,  # treat bullet as a service name
+            kind="service",
+        ))
+
+    return out
+
+
+def _split_tiers(cell_text: str) -> Iterable[tuple[Optional[str], str]]:
+    """
+    Extract inner 'זהב/כסף/ארד' blocks if present; else yield the whole cell once.
+    Works even if markup is lost (uses keywords).
+    """
+    # Try explicit tier blocks like: "זהב: 70% ...\nכסף: 50% ..."
+    parts = _TIER_SPLIT_RE.split(cell_text)
+    if len(parts) > 1:
+        for p in parts:
+            m = _TIER_MATCH_RE.match(p)
+            if m:
+                yield m.group(1), m.group(2).strip()
+        return
+    yield None, cell_text
+
+
+def _clean(s: str | None) -> str:
+    # Called tens of thousands of times during a build; most strings are
+    # already clean, so each pass runs only when its trigger is present.
+    if not s: return ""
+    if "&" in s:
+        s = html.unescape(s)
+    if "\t" in s or "\n" in s or "  " in s:
+        s = _CLEAN_RE.sub(" ", s)
+    return s.strip()
+
+
+def _guess_hmo_from_text(s: str) -> Optional[HMO]:
+    low = s.lower()
+    if "מכבי" in low or "maccabi" in low:   return HMO.MACCABI
+    if "מאוחדת" in low or "meuhedet" in low:return HMO.MEUHEDET
+    if "כללית" in low or "clalit" in low:   return HMO.CLALIT
+    return None
+
+
 # ----------------------------- KB builder -----------------------------
 
 class HtmlKB(IKnowledgeBase):
@@ -71,7 +298,7 @@ class HtmlKB(IKnowledgeBase):
       - Emits one chunk per (service × HMO × tier) benefit, plus contacts/blurbs
       - Embeds once with persistent cache
     """
-    CACHE_VERSION = "2"  # bumped for new serialization
+    CACHE_VERSION = "3"  # bumped for the JSONL + .npy cache layout
 
     def __init__(
         self,
@@ -80,28 +307,46 @@ class HtmlKB(IKnowledgeBase):
         *,
         cache_dir: str = ".kb_cache",
         embeddings_deployment: Optional[str] = None,
+        quantize: bool = False,
     ):
         self.kb_dir = kb_dir
         self.embedder = embedder
         self.cache_dir = cache_dir
         self.embeddings_deployment = embeddings_deployment or getattr(embedder, "default_deployment", "unknown")
+        self.quantize = quantize
 
         self._chunks: List[KBChunk] = []
-        self._vectors: List[List[float]] = []
+        self._vectors: np.ndarray = _normalized_matrix([])
+        self._vectors_q: Optional[np.ndarray] = None
+        self._vec_scales: Optional[np.ndarray] = None
+        # Per-instance LRU over the query-embedding RPC: repeated queries
+        # skip the Azure round trip. Cached as tuples (ndarrays are not
+        # hashable); search() converts back to float32.
+        self._embed_query = lru_cache(maxsize=1024)(self._embed_query_uncached)
 
         os.makedirs(self.cache_dir, exist_ok=True)
         manifest = self._manifest()
         self._fingerprint = self._fingerprint_from_manifest(manifest)
-        cache_path = os.path.join(self.cache_dir, f"kb_{self._fingerprint}.pkl")
+        cache_base = os.path.join(self.cache_dir, f"kb_{self._fingerprint}")
+        meta_path = cache_base + ".meta.json"
+        vec_path = cache_base + ".vecs.npy"
 
-        if os.path.exists(cache_path):
-            self._load_cache(cache_path)
+        if os.path.exists(meta_path) and os.path.exists(vec_path):
+            self._load_cache(meta_path, vec_path)
         else:
-            self._build_and_cache(cache_path, manifest)
+            self._build_locked(cache_base, meta_path, vec_path, manifest)
 
     # --------------------------- Public API ---------------------------
 
-    def search(self, query: str, *, hmo: Optional[HMO], tier: Optional[Tier], top_k: int = 6) -> List[KBChunk]:
+    def search(
+        self,
+        query: str,
+        *,
+        hmo: Optional[HMO],
+        tier: Optional[Tier],
+        top_k: int = 6,
+        query_vec: Optional[Iterable[float]] = None,
+    ) -> List[KBChunk]:
         """
         Searches for the most relevant knowledge base chunks based on the query vector similarity.
 
@@ -115,6 +360,9 @@ class HtmlKB(IKnowledgeBase):
                 results and modify scores. Defaults to None.
             tier (Optional[Tier]): A specified tier that may influence the scoring. Defaults to None.
             top_k (int): The number of top results to be returned. Defaults to 6.
+            query_vec (Optional[Iterable[float]]): A precomputed embedding of the query.
+                Callers that already embedded the query (e.g. for a cache lookup)
+                pass it here and skip a second embeddings round trip. Defaults to None.
 
         Returns:
             List[KBChunk]: A list of the top KBChunk objects that match the search query,
@@ -122,214 +370,205 @@ class HtmlKB(IKnowledgeBase):
         """
         if not self._chunks:
             return []
-        qv = self.embedder.embed_texts([query])[0]
-        scored: List[tuple[float, KBChunk]] = []
-        for vec, ch in zip(self._vectors, self._chunks):
-            score = self._cos(qv, vec)
-            if hmo and ch.hmo and ch.hmo != hmo: score *= 0.75
-            if tier and (tier in ch.tier_tags):   score *= 1.08
-            scored.append((score, ch))
-        scored.sort(key=lambda t: t[0], reverse=True)
-        return [c for _, c in scored[:top_k]]
+        if query_vec is not None:
+            qv = np.asarray(query_vec, dtype=np.float32)
+        else:
+            qv = np.asarray(self._embed_query(query), dtype=np.float32)
+        qv /= np.linalg.norm(qv) or 1.0
+        # Rows are unit-normalized at load, so cosine against every chunk is
+        # one BLAS matvec instead of a Python loop over vectors.
+        if self._vectors_q is not None:
+            scores = self._score_quantized(qv)
+        else:
+            scores = self._vectors @ qv
+        scores = self._bias_scores(scores, hmo, tier)
+        # O(N) partition for the k winners, then sort only those k —
+        # beats a full argsort whenever N >> top_k.
+        k = min(top_k, scores.size)
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx])]
+        return [self._chunks[i] for i in idx]
+
+    def search_batch(
+        self, queries: List[str], *, hmo: Optional[HMO], tier: Optional[Tier], top_k: int = 6
+    ) -> List[List[KBChunk]]:
+        """
+        Runs search() for several queries with one embeddings API call.
+
+        All queries are embedded in a single embed_texts round trip and
+        scored against the chunk matrix with one GEMM, so the per-request
+        RPC overhead is paid once instead of per query. Useful when a turn
+        fans out into multiple sub-queries.
+
+        Parameters:
+            queries (List[str]): The search queries.
+            hmo (Optional[HMO]): Same score bias as in search().
+            tier (Optional[Tier]): Same score bias as in search().
+            top_k (int): The number of top results per query. Defaults to 6.
+
+        Returns:
+            List[List[KBChunk]]: One relevance-ordered result list per
+            query, in the same order as the input.
+        """
+        if not queries:
+            return []
+        if not self._chunks:
+            return [[] for _ in queries]
+        qvs = np.asarray(self.embedder.embed_texts(list(queries)), dtype=np.float32)
+        qvs /= np.linalg.norm(qvs, axis=1, keepdims=True).clip(min=1e-12)
+        if self._vectors_q is not None:
+            scores = np.stack([self._score_quantized(qv) for qv in qvs])
+        else:
+            scores = qvs @ self._vectors.T
+        scores = self._bias_scores(scores, hmo, tier)
+        k = min(top_k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        out: List[List[KBChunk]] = []
+        for row_scores, row_idx in zip(scores, top):
+            order = row_idx[np.argsort(-row_scores[row_idx])]
+            out.append([self._chunks[i] for i in order])
+        return out
+
+    def _embed_query_uncached(self, query: str) -> Tuple[float, ...]:
+        return tuple(self.embedder.embed_texts([query])[0])
+
+    def _bias_scores(self, scores: np.ndarray, hmo: Optional[HMO], tier: Optional[Tier]) -> np.ndarray:
+        """Branchless bias pass over precomputed per-chunk arrays; the masks
+        broadcast over the trailing chunk axis, so batched rows work too."""
+        if hmo:
+            other_hmo = (self._hmo_ids >= 0) & (self._hmo_ids != _HMO2I[hmo])
+            scores = np.where(other_hmo, scores * 0.75, scores)
+        if tier:
+            scores = np.where(self._tier_flags[:, _TIER2I[tier]], scores * 1.08, scores)
+        return scores
 
     # ------------------------ Build & cache --------------------------
 
-    def _build_and_cache(self, cache_path: str, manifest: list[dict]) -> None:
-        for p in [m["path"] for m in manifest]:
-            with open(p, "r", encoding="utf-8", errors="ignore") as f:
-                html_str = f.read()
-            self._chunks.extend(self._extract_chunks_from_html(p, html_str))
+    def _build_locked(self, cache_base: str, meta_path: str, vec_path: str, manifest: list[dict]) -> None:
+        """Serialize cold builds across processes with an exclusive lock file.
 
+        With uvicorn --workers N, every worker can find the cache missing at
+        boot; an O_EXCL lock file elects one builder, and the rest poll until
+        it publishes the cache, then load it. A lock older than an hour is
+        treated as left over from a crashed builder and removed.
+        """
+        lock_path = cache_base + ".lock"
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                time.sleep(0.5)
+                if os.path.exists(meta_path) and os.path.exists(vec_path):
+                    self._load_cache(meta_path, vec_path)
+                    return
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > 3600:
+                        os.remove(lock_path)
+                except OSError:
+                    pass
+                continue
+            try:
+                os.close(fd)
+                self._build_and_cache(meta_path, vec_path, manifest)
+                return
+            finally:
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+
+    def _build_and_cache(self, meta_path: str, vec_path: str, manifest: list[dict]) -> None:
+        paths = [m["path"] for m in manifest]
+        # html.parser is pure-Python and CPU-bound, so a cold build parses
+        # files in parallel across processes. Workers return plain dicts —
+        # only picklable data crosses the pool boundary.
+        if len(paths) > 1:
+            with ProcessPoolExecutor() as ex:
+                per_file = list(ex.map(_parse_file, paths, chunksize=4))
+        else:
+            per_file = [_parse_file(p) for p in paths]
+        for dicts in per_file:
+            self._chunks.extend(KBChunk.from_dict(d) for d in dicts)
+
+        raw_vectors: List[List[float]] = []
         if self._chunks:
             # Embed a normalized view for better retrieval quality
             payloads = [self._normalize_for_embedding(c) for c in self._chunks]
-            self._vectors = self.embedder.embed_texts(payloads)
-
-        payload = {
+            raw_vectors = self.embedder.embed_texts(payloads)
+        self._vectors = _normalized_matrix(raw_vectors)
+
+        # Vectors go to .npy (already normalized, so a reload can mmap them
+        # as-is); chunks go to JSONL with a header line carrying the
+        # version/deployment for the mismatch check. Both are written to
+        # pid-suffixed temp names and renamed into place, so a concurrent
+        # process never observes a half-written file: os.replace is atomic
+        # and the meta file lands last, after the vectors it describes.
+        tmp_vec = f"{vec_path}.{os.getpid()}.tmp"
+        tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_vec, "wb") as f:
+            np.save(f, self._vectors)
+        header = {
             "version": self.CACHE_VERSION,
             "embeddings_deployment": self.embeddings_deployment,
             "manifest": manifest,
-            "chunks": [c.to_dict() for c in self._chunks],
-            "vectors": self._vectors,
         }
-        with open(cache_path, "wb") as f:
-            pickle.dump(payload, f)
-
-    def _load_cache(self, cache_path: str) -> None:
-        with open(cache_path, "rb") as f:
-            payload = pickle.load(f)
-        if payload.get("version") != self.CACHE_VERSION \
-           or payload.get("embeddings_deployment") != self.embeddings_deployment:
-            os.remove(cache_path); raise FileNotFoundError("cache mismatch")
-        self._chunks  = [KBChunk.from_dict(d) for d in payload.get("chunks", [])]
-        self._vectors = payload.get("vectors", [])
-
-    # ------------------------- Extractors ----------------------------
-
-    def _extract_chunks_from_html(self, path: str, html_str: str) -> List[KBChunk]:
-        soup = BeautifulSoup(html_str, "html.parser")
-        chunks: List[KBChunk] = []
-        section = None
-
-        # Track the current section by nearest preceding h1/h2/h3
-        for node in soup.find_all(["h1","h2","h3","table","ul","p"]):
-            if node.name in ("h1","h2","h3"):
-                section = self._clean(node.get_text(" "))
-                continue
-
-            if node.name == "table":
-                chunks.extend(self._extract_table_records(path, node, section))
-            elif node.name == "ul":
-                chunks.extend(self._extract_list_contacts(path, node, section))
-            elif node.name == "p":
-                txt = self._clean(node.get_text(" "))
-                if txt:
-                    chunks.append(KBChunk(
-                        text=txt, source_uri=f"file://{path}#p{hash(txt)%10_000}",
-                        hmo=None, tier_tags=(), section=section, service=None, kind="blurb"
-                    ))
-        return chunks
-
-    def _extract_table_records(self, path: str, table, section: Optional[str]) -> List[KBChunk]:
-        """Build atomic records: (service × hmo × tier) with benefit text."""
-        rows = table.find_all("tr")
-        if not rows: return []
-        headers = [self._clean(th.get_text(" ")) for th in rows[0].find_all(["th","td"])]
-        # Try to identify HMO columns
-        hmo_cols: Dict[int, HMO] = {}
-        for idx, h in enumerate(headers):
-            low = (h or "").lower()
-            if "מכבי" in low or "maccabi" in low:   hmo_cols[idx] = HMO.MACCABI
-            if "מאוחדת" in low or "meuhedet" in low:hmo_cols[idx] = HMO.MEUHEDET
-            if "כללית" in low or "clalit" in low:   hmo_cols[idx] = HMO.CLALIT
-
-        out: List[KBChunk] = []
-        for r_i, tr in enumerate(rows[1:], start=1):
-            cells = tr.find_all(["td","th"])
-            if not cells: continue
-            service = self._clean(cells[0].get_text(" ")) if cells else None
-
-            for c_i, td in enumerate(cells[1:], start=1):
-                hmo = hmo_cols.get(c_i)
-                if not hmo: continue
-                cell_text = self._clean(td.get_text(" ", strip=True))
-                # Split tiers inside cell (bold labels or keywords)
-                for tier_label, benefit in self._split_tiers(cell_text):
-                    out.append(KBChunk(
-                        text=f"{benefit}",
-                        source_uri=f"file://{path}#t{r_i}_{c_i}",
-                        hmo=hmo,
-                        tier_tags=(tier_label,) if tier_label else (),
-                        section=section,
-                        service=service,
-                        kind="benefit",
-                    ))
-        return out
-
-    def _extract_list_contacts(self, path: str, ul, section: Optional[str]) -> List[KBChunk]:
-        """
-        Handles three common <ul> patterns:
-          1) Services bullets (no phones/urls)           -> kind="service",   hmo=None
-          2) HMO contact bullets with phones (and ext)   -> kind="contact",   hmo=parsed
-          3) 'More info' bullets with phone + URL        -> kind="contact",   hmo=parsed, text includes url
-        """
-        out: List[KBChunk] = []
-
-        PHONE_RE = re.compile(
-            r"(?:\d{2,3}-\d{6,7}|"
-            r"\d{1}-\d{3}-\d{2}-\d{2}-\d{2}|"  # 1-700-50-53-53 style
-            r"\*?\d{3,4})"
+        with open(tmp_meta, "wb") as f:
+            f.write(orjson.dumps(header) + b"\n")
+            for c in self._chunks:
+                f.write(orjson.dumps(c.to_dict()) + b"\n")
+        os.replace(tmp_vec, vec_path)
+        os.replace(tmp_meta, meta_path)
+
+        self._build_bias_arrays()
+        self._quantize_vectors()
+
+    def _load_cache(self, meta_path: str, vec_path: str) -> None:
+        with open(meta_path, "rb") as f:
+            header = orjson.loads(f.readline())
+            if header.get("version") != self.CACHE_VERSION \
+               or header.get("embeddings_deployment") != self.embeddings_deployment:
+                os.remove(meta_path); os.remove(vec_path); raise FileNotFoundError("cache mismatch")
+            self._chunks = [KBChunk.from_dict(orjson.loads(line)) for line in f if line.strip()]
+        # mmap'd and already unit-normalized: startup never materializes the
+        # matrix and concurrent processes share the same OS page cache.
+        self._vectors = np.load(vec_path, mmap_mode="r")
+        self._build_bias_arrays()
+        self._quantize_vectors()
+
+    def _build_bias_arrays(self) -> None:
+        """Per-chunk HMO ids and tier membership flags for the branchless
+        score-bias pass in search(); derived from chunks, never persisted."""
+        n = len(self._chunks)
+        self._hmo_ids = np.array(
+            [_HMO2I.get(c.hmo, -1) for c in self._chunks], dtype=np.int8
         )
-        EXT_RE = re.compile(r"שלוחה\s*(\d+)")
-
-        def li_urls(li) -> List[str]:
-            return [a.get("href") for a in li.find_all("a") if a.get("href")]
-
-        for li in ul.find_all("li", recursive=False):
-            raw_txt = li.get_text(" ", strip=True)
-            txt = self._clean(raw_txt)
-            if not txt:
-                continue
-
-            urls = li_urls(li)
-            phones = PHONE_RE.findall(txt)
-            hmo = self._guess_hmo_from_text(txt)
-            ext = EXT_RE.search(txt)
-            has_phone = bool(phones)
-            has_url = bool(urls)
-
-            # Case 2/3: contacts (with optional URL)
-            if has_phone or ("טלפון" in txt) or has_url:
-                bits = []
-                if phones: bits.append("; ".join(phones))
-                if ext:    bits.append(f"שלוחה {ext.group(1)}")
-                if urls:   bits.append("; ".join(urls))
-                payload = " | ".join(bits) if bits else txt
-                out.append(KBChunk(
-                    text=payload,
-                    source_uri=f"file://{path}#c{abs(hash(txt)) % 10_000}",
-                    hmo=hmo,
-                    tier_tags=(),
-                    section=section,
-                    service=None,
-                    kind="contact",
-                ))
-                continue
-
-            # Case 1: plain services bullet (no phones/urls)
-            out.append(KBChunk(
-                text=txt,
-                source_uri=f"file://{path}#s{abs(hash(txt)) % 10_000}",
-                hmo=None,
-                tier_tags=(),
-                section=section,
-                service=txt,  # treat bullet as a service name
-                kind="service",
-            ))
-
-        return out
-
-    # ------------------------- Utilities -----------------------------
-
-    @staticmethod
-    def _split_tiers(cell_text: str) -> Iterable[tuple[Optional[str], str]]:
-        """
-        Extract inner 'זהב/כסף/ארד' blocks if present; else yield the whole cell once.
-        Works even if markup is lost (uses keywords).
-        """
-        # Try explicit tier blocks like: "זהב: 70% ...\nכסף: 50% ..."
-        parts = re.split(r"(?=(?:זהב|כסף|ארד)\s*[:：])", cell_text)
-        if len(parts) > 1:
-            for p in parts:
-                m = re.match(r"(זהב|כסף|ארד)\s*[:：]\s*(.+)", p, re.S)
-                if m:
-                    yield m.group(1), m.group(2).strip()
+        self._tier_flags = np.array(
+            [[t in c.tier_tags for t in _TIERS] for c in self._chunks], dtype=bool
+        ).reshape(n, len(_TIERS))
+
+    def _quantize_vectors(self) -> None:
+        """Opt-in int8 compression of the normalized matrix (see
+        RetrieverConfig.quantize_vectors). Each row is scaled to the full
+        int8 range with its own scale factor and the float32 copy is
+        dropped, so the resident matrix shrinks 4x."""
+        if not self.quantize or not self._vectors.size:
             return
-        yield None, cell_text
+        scales = np.abs(self._vectors).max(axis=1).clip(min=1e-12)
+        self._vectors_q = np.round(self._vectors / scales[:, None] * 127.0).astype(np.int8)
+        self._vec_scales = (scales / 127.0).astype(np.float32)
+        self._vectors = _normalized_matrix([])
+
+    def _score_quantized(self, qv: np.ndarray) -> np.ndarray:
+        """Cosine scores from the int8 matrix: quantize the query the same
+        way, take integer dot products and undo both scale factors."""
+        q_scale = float(np.abs(qv).max()) or 1.0
+        qv_q = np.round(qv / q_scale * 127.0).astype(np.int8)
+        # int32 accumulation — int8×int8 dots overflow int16 at embedding
+        # dimensionality, and only the query-side cast is per-call work.
+        raw = self._vectors_q @ qv_q.astype(np.int32)
+        return raw.astype(np.float32) * (self._vec_scales * (q_scale / 127.0))
 
-    @staticmethod
-    def _clean(s: str | None) -> str:
-        if not s: return ""
-        s = html.unescape(s)
-        s = re.sub(r"[ \t]+", " ", s)
-        s = re.sub(r"\n+", " ", s)
-        return s.strip()
-
-    @staticmethod
-    def _guess_hmo_from_text(s: str) -> Optional[HMO]:
-        low = s.lower()
-        if "מכבי" in low or "maccabi" in low:   return HMO.MACCABI
-        if "מאוחדת" in low or "meuhedet" in low:return HMO.MEUHEDET
-        if "כללית" in low or "clalit" in low:   return HMO.CLALIT
-        return None
-
-    @staticmethod
-    def _cos(a: List[float], b: List[float]) -> float:
-        import math
-        dot = sum(x*y for x, y in zip(a,b))
-        na = math.sqrt(sum(x*x for x in a)) or 1.0
-        nb = math.sqrt(sum(y*y for y in b)) or 1.0
-        return dot/(na*nb)
+    # ------------------------- Utilities -----------------------------
 
     def _normalize_for_embedding(self, c: KBChunk) -> str:
         """Compact, fielded string improves retrieval quality."""
@@ -356,9 +595,37 @@ class HtmlKB(IKnowledgeBase):
         return out
 
     def _fingerprint_from_manifest(self, manifest: list[dict]) -> str:
-        h = hashlib.sha256()
+        # Cache key, not a security primitive — blake2b is the fastest
+        # stdlib hash and an 8-byte digest keeps the 16-hex-char width.
+        h = hashlib.blake2b(digest_size=8)
         h.update(f"ver:{self.CACHE_VERSION}\n".encode())
         h.update(f"deploy:{self.embeddings_deployment}\n".encode())
         for m in manifest:
             h.update(f"{m['path']}|{m['size']}|{m['mtime_ns']}\n".encode())
-        return h.hexdigest()[:16]
+        return h.hexdigest()
+
+
+@lru_cache(maxsize=4)
+def get_shared_kb(
+    kb_dir: str,
+    embedder: IEmbeddingsClient,
+    *,
+    cache_dir: str = ".kb_cache",
+    embeddings_deployment: Optional[str] = None,
+    quantize: bool = False,
+) -> HtmlKB:
+    """
+    Process-level HtmlKB cache keyed on the construction arguments.
+
+    Callers with the same corpus/deployment share one instance, so the
+    manifest scan and cache load run once per process no matter how many
+    services are constructed. Embedder instances hash by identity, which
+    is the granularity that matters here.
+    """
+    return HtmlKB(
+        kb_dir,
+        embedder,
+        cache_dir=cache_dir,
+        embeddings_deployment=embeddings_deployment,
+        quantize=quantize,
+    )
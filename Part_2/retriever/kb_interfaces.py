@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Protocol
+from typing import Iterable, List, Optional, Protocol
 
 from Part_2.core_models import HMO, Tier
 
@@ -36,9 +36,11 @@ class IKnowledgeBase(Protocol):
         hmo: Optional[HMO],
         tier: Optional[Tier],
         top_k: int = 6,
+        query_vec: Optional[Iterable[float]] = None,
     ) -> List[KBItem]:
         """Return up to top_k most relevant KB items for the query,
-        optionally biased by HMO/tier."""
+        optionally biased by HMO/tier. A precomputed query embedding may be
+        supplied to skip the embedding call."""
         ...
 
     @property
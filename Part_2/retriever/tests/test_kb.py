@@ -44,9 +44,11 @@ def test_kb_functionality_and_cache(retriever_config: RetrieverConfig, embedder:
     # Expect at least one chunk
     assert len(kb._chunks) > 0, "Expected KB to have parsed at least one HTML chunk"
 
-    # Cache should exist
-    cached = list(Path(retriever_config.cache_dir).glob("kb_*.pkl"))
+    # Cache should exist (JSONL meta + mmap-able vectors)
+    cached = list(Path(retriever_config.cache_dir).glob("kb_*.meta.json"))
     assert cached, "Expected a cache file to be created after building KB"
+    assert list(Path(retriever_config.cache_dir).glob("kb_*.vecs.npy")), \
+        "Expected a vectors file alongside the chunk metadata"
 
     # Re-load from cache (should be instantaneous)
     kb2 = HtmlKB(
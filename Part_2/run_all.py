@@ -0,0 +1,546 @@
+"""
+Launch all Part 2 services (orchestrator, API gateway, Gradio frontend)
+from one terminal, wait until every one of them is ready, and keep them
+running until Ctrl+C.
+
+Readiness is checked concurrently: every service is polled with its own
+exponential backoff (25ms doubling up to 500ms) over a single shared
+HTTP client, so the total wait is the max of the services instead of
+their sum and a service is detected within milliseconds of its socket
+opening.
+
+Usage:
+    python -m Part_2.run_all
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import httpx
+
+LOG_DIR = os.path.join("Part_2", "logs")
+
+# Auto-reload doubles the process count (watcher parent + worker child)
+# and pays an initial directory scan per service — pure overhead unless
+# actively iterating, so it is opt-in.
+_RELOAD = os.environ.get("RUN_ALL_RELOAD") == "1"
+
+# uvloop (libuv event loop) and httptools (C HTTP parser) replace the pure
+# Python defaults when installed — checked once at import, not per spawn.
+_FAST_STACK: List[str] = []
+if importlib.util.find_spec("uvloop") is not None:
+    _FAST_STACK += ["--loop", "uvloop"]
+if importlib.util.find_spec("httptools") is not None:
+    _FAST_STACK += ["--http", "httptools"]
+
+
+def _uvicorn_cmd(target: str, port: str) -> List[str]:
+    # --no-access-log: the gateway/orchestrator hot path shouldn't pay a
+    # formatted log line per proxied request.
+    cmd = [sys.executable, "-m", "uvicorn", target,
+           "--port", port, "--no-access-log", *_FAST_STACK]
+    if not _RELOAD:
+        # One worker per core; --reload and --workers are mutually
+        # exclusive in uvicorn, so dev mode keeps the single worker.
+        cmd += ["--workers", str(os.cpu_count() or 2)]
+    if _RELOAD:
+        # Scope the watcher to the service's own package: by default the
+        # stat reloader re-walks the whole working directory every tick,
+        # and a log write would even trigger a spurious reload. A 1s
+        # delay coalesces bursts of saves into one restart.
+        pkg = target.split(".app:", 1)[0].replace(".", os.sep)
+        cmd += ["--reload", "--reload-dir", pkg,
+                "--reload-exclude", os.path.join(LOG_DIR, "*"),
+                "--reload-delay", "1.0"]
+    return cmd
+
+
+# RUN_ALL_PRELOAD=1: fork the uvicorn services from a forkserver that has
+# the heavy shared imports (uvicorn/fastapi/pydantic) already loaded, so
+# the second and third service pay only their differential imports.
+_PRELOAD = os.environ.get("RUN_ALL_PRELOAD") == "1"
+if _PRELOAD:
+    import multiprocessing
+
+    _MP_CTX = multiprocessing.get_context("forkserver")
+    _MP_CTX.set_forkserver_preload(["uvicorn", "fastapi", "pydantic"])
+
+
+def _serve_uvicorn(target: str, port: int, log_path: str) -> None:
+    """Forkserver worker: run one uvicorn app with stdout/stderr on its log."""
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    import uvicorn
+
+    uvicorn.run(target, host="127.0.0.1", port=port, access_log=False)
+
+
+class _MPProc:
+    """Popen-alike over a multiprocessing.Process (preload path only)."""
+
+    def __init__(self, p):
+        self._p = p
+        self.pid = p.pid
+
+    @property
+    def returncode(self):
+        return self._p.exitcode
+
+    def poll(self):
+        return None if self._p.is_alive() else self._p.exitcode
+
+    def terminate(self) -> None:
+        self._p.terminate()
+
+    def kill(self) -> None:
+        self._p.kill()
+
+
+SERVICES: List[Dict] = [
+    {
+        "name": "orchestrator",
+        "cmd": _uvicorn_cmd("Part_2.orchestrator.app:app", "8001"),
+        "app": "Part_2.orchestrator.app:app",
+        "port": 8001,
+        "url": "http://127.0.0.1:8001/health",
+        "log": os.path.join(LOG_DIR, "orchestrator.log"),
+        "ready_line": b"Application startup complete",
+    },
+    {
+        "name": "api_gateway",
+        "cmd": _uvicorn_cmd("Part_2.api_gateway.app:app", "8000"),
+        "app": "Part_2.api_gateway.app:app",
+        "port": 8000,
+        "url": "http://127.0.0.1:8000/health",
+        "log": os.path.join(LOG_DIR, "api_gateway.log"),
+        "ready_line": b"Application startup complete",
+    },
+    {
+        "name": "frontend",
+        "cmd": [sys.executable, "-m", "Part_2.fronted.ui_gradio"],
+        "url": "http://127.0.0.1:7860/",
+        "log": os.path.join(LOG_DIR, "frontend.log"),
+        "ready_line": b"Running on local URL",
+    },
+]
+
+# Health addresses split once at import; the hosts are IP literals, so
+# probes go straight to connect() with no resolver (getaddrinfo/nsswitch)
+# traffic on any attempt.
+for _svc in SERVICES:
+    _parts = urlsplit(_svc["url"])
+    _svc["addr"] = (_parts.hostname or "127.0.0.1",
+                    _parts.port or (443 if _parts.scheme == "https" else 80))
+del _svc, _parts
+
+READY_TIMEOUT_S = 90.0
+LOG_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _open_log(path: str):
+    """Open a log for a child: binary, unbuffered, O_APPEND.
+
+    O_APPEND makes each child write atomic at the kernel offset, and an
+    unbuffered binary fd means nothing queues in parent userspace.
+    Oversized logs rotate to .1 here at launch — once the fd is dup'd
+    into a child its writes follow the inode, so a mid-run rename could
+    not retarget the stream anyway.
+    """
+    try:
+        if os.path.getsize(path) > LOG_MAX_BYTES:
+            os.replace(path, path + ".1")
+    except OSError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_CLOEXEC", 0), 0o644)
+    return os.fdopen(fd, "wb", buffering=0)
+
+
+class _SpawnedProc:
+    """Minimal Popen-alike over a raw pid from os.posix_spawn.
+
+    Exposes exactly what stop_all and the crash checks use: pid, poll(),
+    terminate(), kill().
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is not None:
+            return self.returncode
+        try:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+        except ChildProcessError:
+            self.returncode = 0
+            return self.returncode
+        if pid == 0:
+            return None
+        self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def terminate(self) -> None:
+        self._send(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self._send(signal.SIGKILL)
+
+    def _send(self, sig: int) -> None:
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+
+# With stdout redirected to a file, a child's print() output is
+# block-buffered — Gradio's "Running on local URL" banner would sit in
+# its 8 KB buffer until exit and the log watch below would time out with
+# the service actually up. (uvicorn survives only because it logs to the
+# line-buffered stderr.) Force unbuffered streams in every child.
+_CHILD_ENV = {**os.environ, "PYTHONUNBUFFERED": "1"}
+
+
+def _spawn(cmd: List[str], log_fd: int):
+    """Start a child with stdout/stderr on log_fd.
+
+    posix_spawn (where available) skips fork()'s copy-on-write page-table
+    duplication of the parent interpreter — faster start and no transient
+    RSS spike. Popen covers Windows.
+    """
+    if hasattr(os, "posix_spawn"):
+        file_actions = [
+            (os.POSIX_SPAWN_DUP2, log_fd, 1),
+            (os.POSIX_SPAWN_DUP2, log_fd, 2),
+        ]
+        # Own session per child: uvicorn --reload forks a worker, and a
+        # session id lets stop_all signal the whole tree with one killpg.
+        pid = os.posix_spawn(cmd[0], cmd, _CHILD_ENV, file_actions=file_actions, setsid=True)
+        return _SpawnedProc(pid)
+    return subprocess.Popen(cmd, stdout=log_fd, stderr=subprocess.STDOUT,
+                            env=_CHILD_ENV, start_new_session=hasattr(os, "setsid"))
+
+
+def launch(svc: Dict) -> None:
+    """Spawn one service with stdout/stderr appended to its log file."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log = _open_log(svc["log"])
+    try:
+        svc["log_offset"] = os.path.getsize(svc["log"])
+    except OSError:
+        svc["log_offset"] = 0
+    if _PRELOAD and "app" in svc:
+        # Forked from the warm forkserver; the worker opens its own log fd.
+        p = _MP_CTX.Process(target=_serve_uvicorn,
+                            args=(svc["app"], svc["port"], svc["log"]))
+        p.start()
+        svc["proc"] = _MPProc(p)
+    else:
+        svc["proc"] = _spawn(svc["cmd"], log.fileno())
+    # The child owns a dup of the fd now and tail_log/_watch_log reopen
+    # the file by path, so the parent's handle is pure fd leakage — drop it.
+    log.close()
+    # A pidfd turns "did it exit?" into fd readability, so supervision can
+    # wait on every child with one selector instead of polling pids.
+    svc["pidfd"] = None
+    if hasattr(os, "pidfd_open"):
+        try:
+            svc["pidfd"] = os.pidfd_open(svc["proc"].pid)
+        except OSError:
+            pass
+    print(f"▶ {svc['name']} (pid {svc['proc'].pid}) → {svc['url']}")
+
+
+async def _watch_log(svc: Dict, deadline: float) -> None:
+    """Wait for the service's own startup line to appear in its log.
+
+    uvicorn prints "Application startup complete" (and Gradio "Running on
+    local URL") right as it starts serving, so the log is an event source
+    that needs no TCP connects while the service boots. Only bytes written
+    after our launch count; a sliding window covers markers split across
+    reads.
+    """
+    backoff = 0.025
+    window = b""
+    with open(svc["log"], "rb") as f:
+        f.seek(svc.get("log_offset", 0))
+        while True:
+            chunk = f.read()
+            if chunk:
+                window = (window + chunk)[-4096:]
+                if svc["ready_line"] in window:
+                    return
+                backoff = 0.025  # output is flowing; keep polls tight
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{svc['name']} not ready after {READY_TIMEOUT_S:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 0.5)
+
+
+async def _tcp_up(host: str, port: int, timeout: float = 0.5) -> bool:
+    """True once the listen socket accepts — one RTT, no app-layer work.
+
+    The connect is non-blocking and driven by the event loop's selector,
+    so every service's pending connect sits in the same epoll set: one
+    kernel wait covers N services, and no worker thread blocks in
+    connect() per attempt.
+    """
+    s = socket.socket()
+    s.setblocking(False)
+    try:
+        await asyncio.wait_for(
+            asyncio.get_running_loop().sock_connect(s, (host, port)), timeout)
+        return True
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        s.close()
+
+
+async def _probe(client: httpx.AsyncClient, svc: Dict, deadline: float) -> None:
+    """Wait for the listener with cheap TCP connects, then confirm with
+    exactly one HTTP request.
+
+    Repeated GETs made the booting service parse requests and build
+    responses while importing; a bare connect answers "is it accepting?"
+    in a handful of syscalls. Any confirm status below 500 counts as ready —
+    during boot some endpoints answer 404 before routes are mounted,
+    which still proves the server is up.
+    """
+    host, port = svc["addr"]
+    backoff = 0.025
+    while True:
+        # Cap each connect at the time left so no attempt overshoots the
+        # deadline; monotonic time makes the deadline immune to NTP steps.
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"{svc['name']} not ready after {READY_TIMEOUT_S:.0f}s")
+        if await _tcp_up(host, port, timeout=min(0.5, remaining)):
+            break
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 0.5)
+    try:
+        # HEAD: the status line is all the confirm needs, no body bytes.
+        # The shared client keeps the connection alive, so any retry of
+        # wait_ready reuses it instead of re-handshaking.
+        resp = await client.head(svc["url"])
+    except httpx.HTTPError as e:
+        raise TimeoutError(f"{svc['name']} confirm probe failed: {e}") from e
+    if resp.status_code >= 500:
+        raise TimeoutError(f"{svc['name']} answered {resp.status_code} on {svc['url']}")
+    print(f"✅ {svc['name']} ready ({resp.status_code})")
+
+
+async def _wait_ready_async(services: List[Dict]) -> None:
+    deadline = time.monotonic() + READY_TIMEOUT_S
+    # One shared client: pooled connections mean retries skip the TCP
+    # handshake instead of reconnecting per probe.
+    async with httpx.AsyncClient(timeout=2.0, headers={"User-Agent": "run_all"}) as client:
+        await asyncio.gather(*(_await_ready(client, svc, deadline) for svc in services))
+
+
+async def _await_ready(client: httpx.AsyncClient, svc: Dict, deadline: float) -> None:
+    # Primary signal is the log line (no TCP traffic while booting); one
+    # HTTP probe then confirms the port really answers end to end.
+    await _watch_log(svc, deadline)
+    await _probe(client, svc, deadline)
+
+
+def _tail_lines(path: str, n: int, buf: bytearray) -> List[bytes]:
+    """Last n lines of path, reading backward from the end into buf.
+
+    Blocks land in the caller-supplied buffer via readinto, so tailing
+    several logs in a row reuses one allocation — constant memory
+    however large the logs grew, which matters because this runs exactly
+    on the failure paths where logs are huge.
+    """
+    try:
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            out = b""
+            while pos > 0 and out.count(b"\n") <= n:
+                step = min(len(buf), pos)
+                pos -= step
+                f.seek(pos)
+                view = memoryview(buf)[:step]
+                f.readinto(view)
+                out = bytes(view) + out
+    except OSError:
+        return []
+    return out.splitlines()[-n:]
+
+
+def tail_log(svc: Dict, n: int = 20, _buf: bytearray | None = None) -> None:
+    """Print the last n log lines of a service (used on startup failure)."""
+    lines = _tail_lines(svc["log"], n, bytearray(8192) if _buf is None else _buf)
+    if not lines:
+        return
+    print(f"--- last {n} lines of {svc['log']} ---")
+    for line in lines:
+        print(line.decode("utf-8", errors="ignore").rstrip())
+
+
+def tail_all(services: List[Dict], n: int = 20) -> None:
+    """Tail every service's log in one pass over one shared read buffer."""
+    buf = bytearray(8192)
+    for svc in services:
+        tail_log(svc, n, _buf=buf)
+
+
+async def _watch_crash(services: List[Dict]) -> List[Dict]:
+    """Resolve with the dead services once any child exits.
+
+    SIGCHLD wakes the loop (no scheduled wakeups, reaping stays in
+    poll()); platforms without it fall back to a coarse async poll.
+    """
+    loop = asyncio.get_running_loop()
+    if all(svc.get("pidfd") is not None for svc in services) and services:
+        # pidfds become readable on exit (works for the forkserver's
+        # grandchildren too, which never SIGCHLD this process).
+        ev = asyncio.Event()
+        for svc in services:
+            loop.add_reader(svc["pidfd"], ev.set)
+        try:
+            while True:
+                await ev.wait()
+                ev.clear()
+                dead = [svc for svc in services if svc["proc"].poll() is not None]
+                if dead:
+                    return dead
+        finally:
+            for svc in services:
+                loop.remove_reader(svc["pidfd"])
+    elif hasattr(signal, "SIGCHLD") and not _PRELOAD:
+        ev = asyncio.Event()
+        loop.add_signal_handler(signal.SIGCHLD, ev.set)
+        try:
+            while True:
+                await ev.wait()
+                ev.clear()
+                dead = [svc for svc in services if svc["proc"].poll() is not None]
+                if dead:
+                    return dead
+        finally:
+            loop.remove_signal_handler(signal.SIGCHLD)
+    else:
+        while True:
+            await asyncio.sleep(1)
+            dead = [svc for svc in services if svc["proc"].poll() is not None]
+            if dead:
+                return dead
+
+
+def _signal_tree(proc, sig: int) -> None:
+    """Signal the child's whole session; fall back to the process itself."""
+    try:
+        os.killpg(proc.pid, sig)
+        return
+    except (AttributeError, ProcessLookupError, PermissionError):
+        pass
+    (proc.kill if sig == getattr(signal, "SIGKILL", None) else proc.terminate)()
+
+
+def stop_all(services: List[Dict]) -> None:
+    print("⏹ Stopping all services...")
+    procs = [svc["proc"] for svc in services if svc.get("proc")]
+    for proc in procs:
+        if proc.poll() is None:
+            _signal_tree(proc, signal.SIGTERM)
+    # Wait on actual exits, not a fixed sleep: children usually go in
+    # tens of ms, so shutdown costs what it costs — 1.5s is the ceiling.
+    deadline = time.monotonic() + 1.5
+    live = [svc for svc in services if svc.get("proc") and svc["proc"].poll() is None]
+    if live and all(svc.get("pidfd") is not None for svc in live):
+        # One selector sleeps on every pidfd at once; each readable fd is
+        # an exited child, so there is no polling interval at all.
+        with selectors.DefaultSelector() as sel:
+            for svc in live:
+                sel.register(svc["pidfd"], selectors.EVENT_READ, svc)
+            while live:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(timeout=remaining):
+                    svc = key.data
+                    if svc["proc"].poll() is not None:
+                        sel.unregister(key.fileobj)
+                        live.remove(svc)
+    else:
+        while time.monotonic() < deadline and any(p.poll() is None for p in procs):
+            time.sleep(0.02)
+    for proc in procs:
+        if proc.poll() is None:
+            _signal_tree(proc, signal.SIGKILL)
+    for svc in services:
+        fd = svc.get("pidfd")
+        if fd is not None:
+            os.close(fd)
+            svc["pidfd"] = None
+    print("✅ All services stopped.")
+
+
+def _report_dead(dead: List[Dict]) -> None:
+    for svc in dead:
+        print(f"❌ {svc['name']} exited (code {svc['proc'].returncode})")
+    tail_all(dead)
+
+
+async def _main_async() -> int:
+    """One event loop drives everything: spawn, readiness, crash watch.
+
+    Readiness and the crash watcher run concurrently, so a service that
+    dies while the others are still importing is reported immediately
+    instead of after the readiness timeout.
+    """
+    # Spawn back-to-back: the processes boot independently and readiness
+    # is awaited concurrently, so staggering only added wall clock.
+    for svc in SERVICES:
+        launch(svc)
+
+    ready = asyncio.create_task(_wait_ready_async(SERVICES))
+    crash = asyncio.create_task(_watch_crash(SERVICES))
+    done, _ = await asyncio.wait({ready, crash}, return_when=asyncio.FIRST_COMPLETED)
+
+    if crash in done:
+        ready.cancel()
+        await asyncio.gather(ready, return_exceptions=True)
+        _report_dead(crash.result())
+        return 1
+
+    try:
+        ready.result()
+    except TimeoutError as e:
+        crash.cancel()
+        await asyncio.gather(crash, return_exceptions=True)
+        print(f"❌ {e}")
+        tail_all(SERVICES)
+        return 1
+
+    print("🚀 All services up — Ctrl+C to stop.")
+    _report_dead(await crash)
+    return 1
+
+
+def main() -> None:
+    try:
+        code = asyncio.run(_main_async())
+    except KeyboardInterrupt:
+        stop_all(SERVICES)
+        return
+    stop_all(SERVICES)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()